@@ -1,36 +1,307 @@
-from flask import Flask, render_template, request, jsonify
+import hashlib
+import json
+import os
+import threading
+
+from flask import Flask, Response, abort, render_template, request, jsonify, url_for
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from assets import AssetPipeline
+from metrics import PROMETHEUS_MIMETYPE, RequestMetrics
+from precompressed import PrecompressedBody
+from rate_limit import TokenBucketLimiter, retry_after_header
+from response_cache import LRUCache
+from search_index import load_catalog
+from user_store import DEFAULT_ITERATIONS, Authenticator, SQLiteUserStore
 
 app = Flask(__name__)
+app.config["SEARCH_CACHE_SIZE"] = int(os.environ.get("SEARCH_CACHE_SIZE", 4096))
+app.config["SEARCH_CACHE_TTL"] = float(os.environ.get("SEARCH_CACHE_TTL", 300))
+app.config["SEARCH_MAX_AGE"] = int(os.environ.get("SEARCH_MAX_AGE", 60))
+# Upper bound on results per page; 0 means unbounded.
+app.config["SEARCH_MAX_LIMIT"] = int(os.environ.get("SEARCH_MAX_LIMIT", 0))
+app.config["SEARCH_STREAM_CHUNK"] = int(os.environ.get("SEARCH_STREAM_CHUNK", 256))
+app.config["ASSET_MINIFY"] = os.environ.get("ASSET_MINIFY", "1") != "0"
+app.config["USER_DB_PATH"] = os.environ.get("USER_DB_PATH", os.path.join(app.instance_path, "users.db"))
+app.config["PASSWORD_HASH_ITERATIONS"] = int(os.environ.get("PASSWORD_HASH_ITERATIONS", DEFAULT_ITERATIONS))
+app.config["PASSWORD_HASH_WORKERS"] = int(os.environ.get("PASSWORD_HASH_WORKERS", 4))
+app.config["LOGIN_CACHE_TTL"] = float(os.environ.get("LOGIN_CACHE_TTL", 30))
+app.config["LOGIN_RATE_PER_IP"] = float(os.environ.get("LOGIN_RATE_PER_IP", 10))
+app.config["LOGIN_BURST_PER_IP"] = float(os.environ.get("LOGIN_BURST_PER_IP", 50))
+app.config["LOGIN_FAILURES_PER_USER"] = float(os.environ.get("LOGIN_FAILURES_PER_USER", 10))
+app.config["LOGIN_FAILURE_WINDOW"] = float(os.environ.get("LOGIN_FAILURE_WINDOW", 60))
+app.config["BATCH_MAX_OPERATIONS"] = int(os.environ.get("BATCH_MAX_OPERATIONS", 50))
+app.config["BATCH_MAX_BYTES"] = int(os.environ.get("BATCH_MAX_BYTES", 64 * 1024))
+# Each login op hashes a password (~0.1 s at the default iterations), so far fewer fit in a batch.
+app.config["BATCH_MAX_LOGINS"] = int(os.environ.get("BATCH_MAX_LOGINS", 5))
+# Test-only endpoints such as /api/reset; never enable on a public deployment.
+app.config["ENABLE_TEST_ENDPOINTS"] = os.environ.get("ENABLE_TEST_ENDPOINTS", "0") == "1"
+# Reverse proxies in front of the app whose X-Forwarded-For is trusted; Railway adds one.
+app.config["TRUSTED_PROXY_HOPS"] = int(
+    os.environ.get("TRUSTED_PROXY_HOPS", 1 if os.environ.get("RAILWAY_ENVIRONMENT") else 0)
+)
+if app.config["TRUSTED_PROXY_HOPS"]:
+    # Otherwise request.remote_addr is the proxy, and the per-IP login limiter is one shared bucket.
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["TRUSTED_PROXY_HOPS"])
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# Per-route latency and status counters; METRICS_DIR shares them across gunicorn workers.
+request_metrics = RequestMetrics(os.environ.get("METRICS_DIR"))
+request_metrics.init_app(app)
+
+# Built once per worker; swap in another Catalog to change the search backend.
+catalog = load_catalog()
+
+# Serialized search responses keyed by (query, limit, offset), shared by all requests in this worker.
+search_cache = LRUCache(app.config["SEARCH_CACHE_SIZE"], app.config["SEARCH_CACHE_TTL"])
+
+
+def _int_arg(args, name, default=None, minimum=0):
+    """Parse a non-negative integer parameter from ``args``, raising ValueError on bad input."""
+    raw = args.get(name)
+    if raw is None or raw == "":
+        return default
+    # JSON bodies (batch ops) can carry true or 1.5, which int() would quietly accept.
+    if isinstance(raw, bool) or (isinstance(raw, float) and not raw.is_integer()):
+        raise ValueError(f"{name} must be an integer")
+    value = int(raw)
+    if value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}")
+    return value
+
+
+authenticator = Authenticator(
+    SQLiteUserStore(app.config["USER_DB_PATH"]),
+    iterations=app.config["PASSWORD_HASH_ITERATIONS"],
+    workers=app.config["PASSWORD_HASH_WORKERS"],
+    cache_ttl=app.config["LOGIN_CACHE_TTL"],
+)
+# Per-client request throttle, plus a per-username budget of failed attempts against brute forcing.
+login_ip_limiter = TokenBucketLimiter(app.config["LOGIN_RATE_PER_IP"], app.config["LOGIN_BURST_PER_IP"])
+login_failure_limiter = TokenBucketLimiter(
+    app.config["LOGIN_FAILURES_PER_USER"] / app.config["LOGIN_FAILURE_WINDOW"],
+    app.config["LOGIN_FAILURES_PER_USER"],
+)
+if authenticator.store.count() == 0:
+    # Seed the demo account the UI and Robot suites log in with.
+    authenticator.set_password("admin", "password")
+
+# Fingerprinted, precompressed copies of static/, built once per worker.
+asset_pipeline = AssetPipeline(app.static_folder, minify=app.config["ASSET_MINIFY"])
+
+
+@app.context_processor
+def inject_asset_url():
+    def asset_url(name):
+        return asset_pipeline.url(name) or url_for("static", filename=name)
+
+    return {"asset_url": asset_url}
+
+
+@app.route("/assets/<path:filename>")
+def assets(filename):
+    asset = asset_pipeline.get(filename)
+    if asset is None:
+        abort(404)
+    return asset.make_response(request)
+
+
+# The index page has no per-request state, so it is rendered and compressed once per worker.
+_index_page = None
+_index_page_lock = threading.Lock()
+
+
+def _get_index_page():
+    global _index_page
+    if app.debug:
+        # Keep template edits visible during local development.
+        return PrecompressedBody(render_template("index.html").encode(), "text/html")
+    if _index_page is None:
+        with _index_page_lock:
+            if _index_page is None:
+                html = render_template("index.html")
+                _index_page = PrecompressedBody(html.encode(), "text/html")
+    return _index_page
 
 
 @app.route("/")
 def index():
-    return render_template("index.html")
+    return _get_index_page().make_response(request)
 
 
-@app.route("/api/login", methods=["POST"])
-def api_login():
-    data = request.get_json()
+def _login(data):
+    """Shared login logic; returns (payload, status, headers)."""
     username = data.get("username", "")
     password = data.get("password", "")
-    if username == "admin" and password == "password":
-        return jsonify({"success": True, "message": f"Welcome, {username}!"})
-    return jsonify({"success": False, "message": "Invalid credentials"}), 401
+    if not isinstance(username, str) or not isinstance(password, str):
+        return {"success": False, "message": "Invalid credentials"}, 401, {}
+    try:
+        # The user table (SQLite) only takes valid UTF-8; JSON can carry lone surrogates.
+        username.encode()
+    except UnicodeEncodeError:
+        return {"success": False, "message": "Username must be valid Unicode"}, 400, {}
+
+    wait = max(
+        login_ip_limiter.acquire(request.remote_addr or ""),
+        login_failure_limiter.retry_after(username),
+    )
+    if wait:
+        payload = {"success": False, "message": "Too many login attempts"}
+        return payload, 429, {"Retry-After": retry_after_header(wait)}
+
+    if authenticator.authenticate(username, password):
+        return {"success": True, "message": f"Welcome, {username}!"}, 200, {}
+    login_failure_limiter.acquire(username)
+    return {"success": False, "message": "Invalid credentials"}, 401, {}
+
+
+def _greet(data):
+    """Shared greeting logic; returns (payload, status, headers)."""
+    name = data.get("name", "World")
+    return {"greeting": f"Hello, {name}!"}, 200, {}
+
+
+def _search_params(args):
+    """Parse search parameters from a mapping; raises ValueError on bad paging values."""
+    query = args.get("q", "")
+    if not isinstance(query, str):
+        raise TypeError("q must be a string")
+    limit = _int_arg(args, "limit")
+    max_limit = app.config["SEARCH_MAX_LIMIT"]
+    if max_limit and (limit is None or limit > max_limit):
+        limit = max_limit
+    return query, limit, _int_arg(args, "offset", default=0)
+
+
+def _wants_ndjson():
+    if request.args.get("stream", "").lower() in ("1", "true", "ndjson"):
+        return True
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def _stream_results(results):
+    """Yield NDJSON lines (one JSON string per result) in chunks to keep writes few and memory flat."""
+    chunk_size = app.config["SEARCH_STREAM_CHUNK"]
+    buffer = []
+    for item in results:
+        buffer.append(json.dumps(item))
+        if len(buffer) >= chunk_size:
+            yield "\n".join(buffer) + "\n"
+            buffer.clear()
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+def _search(args):
+    """Shared search logic; returns (payload, status, headers)."""
+    try:
+        query, limit, offset = _search_params(args)
+    except (TypeError, ValueError):
+        return {"error": "q must be a string; limit and offset non-negative integers"}, 400, {}
+    return {"results": catalog.search(query, limit=limit, offset=offset), "query": query}, 200, {}
+
+
+@app.route("/api/login", methods=["POST"])
+def api_login():
+    payload, status, headers = _login(request.get_json())
+    return jsonify(payload), status, headers
 
 
 @app.route("/api/greet", methods=["POST"])
 def api_greet():
-    data = request.get_json()
-    name = data.get("name", "World")
-    return jsonify({"greeting": f"Hello, {name}!"})
+    payload, status, headers = _greet(request.get_json())
+    return jsonify(payload), status, headers
 
 
 @app.route("/api/search", methods=["GET"])
 def api_search():
-    query = request.args.get("q", "")
-    items = ["Apple", "Banana", "Cherry", "Date", "Elderberry", "Fig", "Grape"]
-    results = [i for i in items if query.lower() in i.lower()] if query else items
-    return jsonify({"results": results, "query": query})
+    try:
+        query, limit, offset = _search_params(request.args)
+    except ValueError:
+        return jsonify({"error": "limit and offset must be non-negative integers"}), 400
+
+    if _wants_ndjson():
+        results = catalog.iter_page(query, limit=limit, offset=offset)
+        response = Response(_stream_results(results), mimetype=NDJSON_MIMETYPE)
+        # The same URL serves JSON or NDJSON by Accept; caches must keep them apart.
+        response.vary.add("Accept")
+        return response
+
+    key = (query, limit, offset)
+    cached = search_cache.get(key)
+    if cached is None:
+        results = catalog.search(query, limit=limit, offset=offset)
+        body = app.json.dumps({"results": results, "query": query}) + "\n"
+        body = body.encode()
+        cached = (body, hashlib.sha256(body).hexdigest()[:32])
+        search_cache.set(key, cached)
+
+    body, etag = cached
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.vary.add("Accept")
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config["SEARCH_MAX_AGE"]
+    return response.make_conditional(request)
+
+
+BATCH_OPERATIONS = {"login": _login, "greet": _greet, "search": _search}
+
+
+@app.route("/api/batch", methods=["POST"])
+def api_batch():
+    """Run several login/greet/search operations in one request.
+
+    Body: ``[{"op": "login", "args": {...}}, ...]``. Each result carries its own
+    status: ``{"results": [{"status": 200, "body": {...}}, ...]}``.
+    """
+    request.max_content_length = app.config["BATCH_MAX_BYTES"]
+    try:
+        operations = request.get_json(silent=True)
+    except RequestEntityTooLarge:
+        return jsonify({"error": f"Batch body exceeds {app.config['BATCH_MAX_BYTES']} bytes"}), 413
+    if not isinstance(operations, list):
+        return jsonify({"error": "Expected a JSON array of operations"}), 400
+    if len(operations) > app.config["BATCH_MAX_OPERATIONS"]:
+        return jsonify({"error": f"At most {app.config['BATCH_MAX_OPERATIONS']} operations per batch"}), 413
+    logins = sum(1 for operation in operations if isinstance(operation, dict) and operation.get("op") == "login")
+    if logins > app.config["BATCH_MAX_LOGINS"]:
+        return jsonify({"error": f"At most {app.config['BATCH_MAX_LOGINS']} login operations per batch"}), 413
+
+    results = []
+    for operation in operations:
+        handler = BATCH_OPERATIONS.get(operation.get("op")) if isinstance(operation, dict) else None
+        args = operation.get("args", {}) if handler else None
+        if handler is None or not isinstance(args, dict):
+            results.append({"status": 400, "body": {"error": "Unknown operation or malformed args"}})
+            continue
+        payload, status, _headers = handler(args)
+        results.append({"status": status, "body": payload})
+    return jsonify({"results": results})
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(request_metrics.render(), mimetype=PROMETHEUS_MIMETYPE)
+
+
+@app.route("/api/search/cache", methods=["GET"])
+def api_search_cache():
+    return jsonify(search_cache.stats())
+
+
+@app.route("/api/reset", methods=["POST"])
+def api_reset():
+    """Reset server-side state between tests: login throttles and caches (this worker only)."""
+    if not app.config["ENABLE_TEST_ENDPOINTS"]:
+        abort(404)
+    login_ip_limiter.reset()
+    login_failure_limiter.reset()
+    authenticator.cache.clear()
+    search_cache.clear()
+    return jsonify({"reset": ["login_ip_limiter", "login_failure_limiter", "login_cache", "search_cache"]})
 
 
 if __name__ == "__main__":
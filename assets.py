@@ -0,0 +1,119 @@
+"""
+Static asset pipeline: minify, fingerprint and precompress files under static/.
+
+Every asset is processed once when the app starts. Its URL embeds a hash of
+the final content (``style.css`` → ``/assets/style.3f2a9c1b7e4d.css``), so the
+response can be cached for a year as immutable and a changed file simply gets
+a new URL. The manifest can be inspected offline with::
+
+    python assets.py [--no-minify]
+"""
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from precompressed import PrecompressedBody
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_CSS_TOKEN = re.compile(
+    r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""  # strings are kept verbatim
+    r"""|(/\*.*?\*/)"""                             # comments are dropped
+    r"""|(\s+)""",                                  # whitespace runs are collapsed
+    re.DOTALL,
+)
+_CSS_PUNCT_SPACE = re.compile(r"\s*([{};,>])\s*")
+
+
+def minify_css(text: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet, leaving strings untouched."""
+    strings = []
+
+    def _token(m):
+        if m.group(1):
+            strings.append(m.group(1))
+            return f"\0{len(strings) - 1}\0"
+        return "" if m.group(2) else " "
+
+    text = _CSS_TOKEN.sub(_token, text)
+    text = _CSS_PUNCT_SPACE.sub(r"\1", text).replace(";}", "}").strip()
+    return re.sub(r"\0(\d+)\0", lambda m: strings[int(m.group(1))], text)
+
+
+MINIFIERS = {".css": minify_css}
+
+
+def fingerprint(name: str, data: bytes) -> str:
+    """Return ``name`` with a content hash inserted before the extension."""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+class AssetPipeline:
+    """Fingerprinted, precompressed copies of every file in a static directory."""
+
+    def __init__(self, static_dir: str, url_prefix: str = "/assets", minify: bool = True):
+        self.static_dir = static_dir
+        self.url_prefix = url_prefix.rstrip("/")
+        self.minify = minify
+        self.manifest: dict[str, str] = {}
+        self.assets: dict[str, PrecompressedBody] = {}
+        self.build()
+
+    def build(self) -> None:
+        manifest, assets = {}, {}
+        for root, _dirs, files in os.walk(self.static_dir):
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.static_dir).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    data = f.read()
+
+                minifier = MINIFIERS.get(os.path.splitext(name)[1]) if self.minify else None
+                if minifier is not None:
+                    data = minifier(data.decode("utf-8")).encode("utf-8")
+
+                hashed = fingerprint(name, data)
+                mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                manifest[name] = hashed
+                assets[hashed] = PrecompressedBody(data, mimetype, IMMUTABLE_CACHE_CONTROL)
+        self.manifest, self.assets = manifest, assets
+
+    def url(self, name: str) -> str | None:
+        """Return the fingerprinted URL for ``name``, or ``None`` if it is not a known asset."""
+        hashed = self.manifest.get(name)
+        return None if hashed is None else f"{self.url_prefix}/{hashed}"
+
+    def get(self, hashed: str) -> PrecompressedBody | None:
+        return self.assets.get(hashed)
+
+    def describe(self) -> dict:
+        """Return the manifest with per-variant sizes, for inspection and offline checks."""
+        return {
+            name: {
+                "url": self.url(name),
+                "sizes": {enc: len(body) for enc, body in self.assets[hashed].variants.items()},
+            }
+            for name, hashed in self.manifest.items()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the static asset manifest as JSON.")
+    parser.add_argument(
+        "--static-dir",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"),
+    )
+    parser.add_argument("--no-minify", action="store_true", help="Fingerprint assets without minifying them")
+    args = parser.parse_args()
+
+    pipeline = AssetPipeline(args.static_dir, minify=not args.no_minify)
+    print(json.dumps(pipeline.describe(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Scaling benchmark for the KaneAI step extractor in mcp-server/server.py.
+
+Writes synthetic KaneAI scripts (see ``kaneai_synth.py``) of increasing size
+to a temporary directory and times ``_read_steps`` on each. Linear scaling
+shows up as a roughly constant time per step across sizes.
+
+    python benchmarks/bench_extract_steps.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "mcp-server"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from kaneai_synth import write_script  # noqa: E402
+from server import _read_steps  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated step counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions per size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'steps':>8} {'lines':>9} {'seconds':>9} {'us/step':>8}")
+        for size in (int(s) for s in args.sizes.split(",")):
+            path = os.path.join(tmp, f"kaneai_{size}.py")
+            write_script(path, size)
+            with open(path) as f:
+                line_count = sum(1 for _ in f)
+
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                steps = _read_steps(path)
+                best = min(best, time.perf_counter() - start)
+            assert len(steps) == size
+            print(f"{size:>8} {line_count:>9} {best:>9.4f} {best / size * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Overhead benchmark for the request metrics middleware.
+
+Measures the cost of a single ``RequestMetrics.observe`` call and the extra
+latency per request that the before/after-request hooks add to a minimal
+Flask app, using the test client so no network is involved.
+
+    python benchmarks/bench_metrics.py [--requests 20000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from metrics import RequestMetrics  # noqa: E402
+
+
+def make_app(metrics=None):
+    app = Flask(__name__)
+
+    @app.route("/ping")
+    def ping():
+        return "pong"
+
+    if metrics is not None:
+        metrics.init_app(app)
+    return app
+
+
+def time_requests(app, count):
+    client = app.test_client()
+    for _ in range(200):
+        client.get("/ping")
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get("/ping")
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--observations", type=int, default=500_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    metrics = RequestMetrics()
+    start = time.perf_counter()
+    for i in range(args.observations):
+        metrics.observe("api_search", "GET", 200, (i % 100) / 1000)
+    observe = (time.perf_counter() - start) / args.observations
+
+    bare = time_requests(make_app(), args.requests)
+    with tempfile.TemporaryDirectory() as directory:
+        instrumented = time_requests(make_app(RequestMetrics(directory)), args.requests)
+
+    print(f"observe():                {observe * 1e6:.2f} us/call")
+    print(f"request without metrics:  {bare * 1e6:.1f} us")
+    print(f"request with metrics:     {instrumented * 1e6:.1f} us")
+    print(f"middleware overhead:      {(instrumented - bare) * 1e6:.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Scale and memory benchmark for the KaneAI → Robot migration pipeline.
+
+Generates synthetic KaneAI scripts (see ``kaneai_synth.py``) of increasing
+size and measures each stage of mcp-server/server.py separately:
+
+* ``extract``        — ``_extract_steps`` on the script source
+* ``map_keywords``   — ``_step_to_robot_keyword`` for every step
+* ``emit``           — ``_steps_to_robot`` without the optimizer
+* ``emit_optimized`` — ``_steps_to_robot`` with the optimizer
+
+Each stage reports best-of-N wall time, steps per second and peak traced
+memory (measured in a separate, untimed run under ``tracemalloc``).
+
+    python benchmarks/bench_migration.py --sizes 10,1000,10000,100000 --output migration.json
+    python benchmarks/bench_migration.py --baseline benchmarks/migration_baseline.json --threshold 20
+
+With ``--baseline`` the script exits with status 1 if any stage's throughput
+drops, or its peak memory rises, by more than ``--threshold`` percent.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "mcp-server"))
+sys.path.insert(0, BENCH_DIR)
+
+from kaneai_synth import write_script  # noqa: E402
+from server import _extract_steps, _page_locators, _step_to_robot_keyword, _steps_to_robot  # noqa: E402
+
+
+def make_stages(source: str, locators):
+    steps = _extract_steps(source)
+    return steps, {
+        "extract": lambda: _extract_steps(source),
+        "map_keywords": lambda: [_step_to_robot_keyword(s, locators=locators) for s in steps],
+        "emit": lambda: _steps_to_robot("Synthetic", steps, locators=locators),
+        "emit_optimized": lambda: _steps_to_robot("Synthetic", steps, locators=locators, optimize=True),
+    }
+
+
+def measure(fn, repeat: int) -> tuple[float, int]:
+    """Return ``(best seconds, peak traced bytes)`` for ``fn``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return human-readable regressions of ``current`` against ``baseline``."""
+    regressions = []
+    for size, stages in baseline.get("sizes", {}).items():
+        for stage, base in stages.items():
+            cur = current["sizes"].get(size, {}).get(stage)
+            if cur is None:
+                continue
+            name = f"{stage}@{size}"
+            if base["steps_per_sec"] and cur["steps_per_sec"] < base["steps_per_sec"] * (1 - threshold / 100):
+                regressions.append(
+                    f"{name}: {cur['steps_per_sec']} steps/s < baseline {base['steps_per_sec']} steps/s"
+                )
+            if base["peak_kib"] and cur["peak_kib"] > base["peak_kib"] * (1 + threshold / 100):
+                regressions.append(f"{name}: peak {cur['peak_kib']} KiB > baseline {base['peak_kib']} KiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scale and memory benchmark for the migration pipeline")
+    parser.add_argument("--sizes", default="10,1000,10000,100000", help="Comma-separated step counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions per stage")
+    parser.add_argument("--output", default="", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", default="", help="Compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed regression in percent")
+    parser.add_argument("--save-baseline", default="", help="Also write the results to this baseline path")
+    args = parser.parse_args()
+
+    locators = _page_locators()
+    sizes = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'steps':>8} {'stage':<15} {'seconds':>9} {'steps/s':>11} {'peak KiB':>9}", file=sys.stderr)
+        for size in (int(s) for s in args.sizes.split(",")):
+            path = os.path.join(tmp, f"kaneai_{size}.py")
+            write_script(path, size)
+            with open(path, encoding="utf-8") as f:
+                source = f.read()
+
+            steps, stages = make_stages(source, locators)
+            assert len(steps) == size
+            results = {}
+            for stage, fn in stages.items():
+                seconds, peak = measure(fn, args.repeat)
+                results[stage] = {
+                    "seconds": round(seconds, 6),
+                    "steps_per_sec": round(size / seconds) if seconds else 0,
+                    "peak_kib": round(peak / 1024, 1),
+                }
+                r = results[stage]
+                print(f"{size:>8} {stage:<15} {seconds:>9.4f} {r['steps_per_sec']:>11} {r['peak_kib']:>9}",
+                      file=sys.stderr)
+            sizes[str(size)] = results
+
+    results = {
+        "config": {
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "sizes": sizes,
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold}% against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Microbenchmark for the sharded token-bucket limiter guarding /api/login.
+
+Reports the mean cost of one ``acquire`` call, single-threaded and with
+several threads hitting distinct keys at once, to show the limiter adds
+microseconds per request. The spray case fills every shard to its key cap
+first and then acquires only new keys, as a username spray against the
+per-user failure limiter does.
+
+    python benchmarks/bench_rate_limit.py [--calls 200000] [--threads 8]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limit import TokenBucketLimiter  # noqa: E402
+
+
+def bench_single(limiter, calls, keys):
+    start = time.perf_counter()
+    for i in range(calls):
+        limiter.acquire(keys[i % len(keys)])
+    return (time.perf_counter() - start) / calls
+
+
+def bench_threads(limiter, calls, keys, threads):
+    per_thread = calls // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(offset):
+        barrier.wait()
+        for i in range(per_thread):
+            limiter.acquire(keys[(offset + i) % len(keys)])
+
+    pool = [threading.Thread(target=worker, args=(n * 997,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    return (time.perf_counter() - start) / (per_thread * threads)
+
+
+def bench_spray(limiter, calls):
+    total = limiter.max_keys_per_shard * len(limiter._shards)
+    for i in range(total):
+        limiter.acquire(f"user{i}")
+    start = time.perf_counter()
+    for i in range(total, total + calls):
+        limiter.acquire(f"user{i}")
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    keys = [f"10.0.{i // 256}.{i % 256}" for i in range(args.keys)]
+    single = bench_single(TokenBucketLimiter(1000, 1000), args.calls, keys)
+    threaded = bench_threads(TokenBucketLimiter(1000, 1000), args.calls, keys, args.threads)
+    # Same settings as the app's login_failure_limiter: 10 failures per 60 s.
+    spray = bench_spray(TokenBucketLimiter(10 / 60, 10), args.calls)
+
+    print(f"acquire, 1 thread:         {single * 1e6:.2f} us/call")
+    print(f"acquire, {args.threads} threads:        {threaded * 1e6:.2f} us/call (wall clock / total calls)")
+    print(f"acquire, shards at cap:    {spray * 1e6:.2f} us/call (new key every call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+HTTP load and latency benchmark for the Flask endpoints.
+
+Starts ``app:app`` under a local gunicorn on a free port, drives ``/``,
+``/api/login``, ``/api/greet`` and ``/api/search`` in turn with keep-alive
+client threads, and writes throughput and p50/p95/p99 latency per endpoint to
+JSON. Everything runs offline on one machine.
+
+    python benchmarks/http_bench.py --concurrency 8 --duration 10 --output bench.json
+    python benchmarks/http_bench.py --baseline benchmarks/baseline.json --threshold 15
+
+With ``--baseline`` the run is compared against a stored result and the script
+exits with status 1 if any endpoint's throughput drops, or its p95 latency
+rises, by more than ``--threshold`` percent. ``--save-baseline`` writes the
+current run as the new baseline.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+
+from parallel_robot import free_port, start_app  # noqa: E402
+
+SCENARIOS = {
+    "index": ("GET", "/", None),
+    "api_login": ("POST", "/api/login", {"username": "admin", "password": "password"}),
+    "api_greet": ("POST", "/api/greet", {"name": "Robot"}),
+    "api_search": ("GET", "/api/search?q=an", None),
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def run_scenario(port: int, method: str, path: str, body, concurrency: int, duration: float) -> dict:
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload else {}
+    latencies: list[list[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    barrier = threading.Barrier(concurrency + 1)
+    stop_at = [0.0]
+
+    def worker(n):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        samples = latencies[n]
+        barrier.wait()
+        while time.perf_counter() < stop_at[0]:
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    errors[n] += 1
+            except (OSError, http.client.HTTPException):
+                errors[n] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                continue
+            samples.append(time.perf_counter() - start)
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    stop_at[0] = time.perf_counter() + duration
+    started = time.perf_counter()
+    barrier.wait()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    samples = sorted(s for per_thread in latencies for s in per_thread)
+    return {
+        "requests": len(samples),
+        "errors": sum(errors),
+        "throughput_rps": round(len(samples) / elapsed, 1),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return human-readable regressions of ``current`` against ``baseline``."""
+    regressions = []
+    for name, base in baseline.get("endpoints", {}).items():
+        cur = current["endpoints"].get(name)
+        if cur is None:
+            continue
+        if base["throughput_rps"] and cur["throughput_rps"] < base["throughput_rps"] * (1 - threshold / 100):
+            regressions.append(
+                f"{name}: throughput {cur['throughput_rps']} rps < baseline {base['throughput_rps']} rps"
+            )
+        if base["p95_ms"] and cur["p95_ms"] > base["p95_ms"] * (1 + threshold / 100):
+            regressions.append(f"{name}: p95 {cur['p95_ms']} ms > baseline {base['p95_ms']} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP load and latency benchmark for app.py")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads per endpoint")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to drive each endpoint")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds of unmeasured load per endpoint")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--endpoints", default=",".join(SCENARIOS), help="Comma-separated subset to run")
+    parser.add_argument("--output", default="", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", default="", help="Compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed regression in percent")
+    parser.add_argument("--save-baseline", default="", help="Also write the results to this baseline path")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.endpoints.split(",") if n.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as data_dir:
+        # All load comes from one client IP; keep the login throttle out of the measurement.
+        throttle_off = {"LOGIN_RATE_PER_IP": "1e9", "LOGIN_BURST_PER_IP": "1e9"}
+        server = start_app(port, data_dir, workers=args.workers, threads=1, env=throttle_off)
+        try:
+            endpoints = {}
+            for name in names:
+                method, path, body = SCENARIOS[name]
+                if args.warmup:
+                    run_scenario(port, method, path, body, args.concurrency, args.warmup)
+                endpoints[name] = run_scenario(port, method, path, body, args.concurrency, args.duration)
+                print(f"{name:12s} {endpoints[name]}", file=sys.stderr)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    results = {
+        "config": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "endpoints": endpoints,
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold}% against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
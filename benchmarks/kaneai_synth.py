@@ -0,0 +1,77 @@
+"""
+Synthetic KaneAI script generator for scale benchmarks.
+
+Splits a real KaneAI script (``kane-ai-generated/kaneai_login_test_positive.py``
+by default) into its preamble, step blocks and epilogue, then writes a script
+of any length by cycling through the step blocks and renumbering them. The
+output keeps the shape the extractor sees in practice: the same helper
+preamble, try/except click blocks, vision-model placeholders and
+``implicitly_wait`` lines between steps.
+
+    python benchmarks/kaneai_synth.py --steps 10000 --output /tmp/kaneai_10k.py
+"""
+
+import argparse
+import os
+import re
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TEMPLATE = os.path.join(PROJECT_ROOT, "kane-ai-generated", "kaneai_login_test_positive.py")
+
+_STEP_COMMENT = re.compile(r"^(\s*#\s*Step\s*-\s*)\d+(\s*:.*)$")
+_WAIT_LINE = "    driver.implicitly_wait(6)"
+_QUIT_LINE = "    driver.quit()"
+
+
+def load_template(path: str = DEFAULT_TEMPLATE) -> tuple[list[str], list[list[str]], list[str]]:
+    """Return ``(preamble, step_blocks, epilogue)`` of a KaneAI script.
+
+    Each step block starts with its ``# Step - N :`` comment and excludes the
+    trailing ``implicitly_wait`` and blank lines, which the writer re-adds.
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+
+    starts = [i for i, line in enumerate(lines) if _STEP_COMMENT.match(line)]
+    if not starts:
+        raise ValueError(f"No '# Step - N :' comments in {path}")
+    end = next(i for i in range(starts[-1], len(lines)) if lines[i] == _QUIT_LINE)
+
+    preamble = lines[:starts[0]]
+    while preamble and not preamble[-1].strip():
+        preamble.pop()
+    blocks = []
+    for start, stop in zip(starts, starts[1:] + [end]):
+        block = lines[start:stop]
+        while block and (not block[-1].strip() or block[-1] == _WAIT_LINE):
+            block.pop()
+        blocks.append(block)
+    return preamble, blocks, lines[end:]
+
+
+def write_script(path: str, steps: int, template: str = DEFAULT_TEMPLATE) -> None:
+    """Write a KaneAI-style script with ``steps`` steps modeled on ``template``."""
+    preamble, blocks, epilogue = load_template(template)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(preamble) + "\n")
+        for n in range(1, steps + 1):
+            comment, *body = blocks[(n - 1) % len(blocks)]
+            f.write("\n" + _STEP_COMMENT.sub(rf"\g<1>{n}\g<2>", comment) + "\n")
+            for line in body:
+                f.write(line + "\n")
+            if n < steps:
+                f.write(_WAIT_LINE + "\n")
+        f.write("\n" + "\n".join(epilogue))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic KaneAI script")
+    parser.add_argument("--steps", type=int, default=1000, help="Number of steps to generate")
+    parser.add_argument("--output", required=True, help="Path of the script to write")
+    parser.add_argument("--template", default=DEFAULT_TEMPLATE, help="KaneAI script to model the steps on")
+    args = parser.parse_args()
+    write_script(args.output, args.steps, args.template)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Locator index derived from the DOM of a target page.
+
+The page (``templates/index.html`` by default) is parsed once into two tables
+mapping keywords to ``id:`` locators: one for form fields (input, select,
+textarea) and one for buttons. Keywords come from each element's id (with and
+without a trailing ``-btn``/``-input``/``-select`` suffix), its label, its
+placeholder and its visible text. Buttons without an id are keyed by their
+visible text and located by an exact-text XPath, and a few hand-written
+synonyms are added for buttons whose DOM does not spell out what step
+descriptions call them. Step descriptions are matched against all keywords in
+one pass with an Aho-Corasick automaton, so generated tests use cheap ``id:``
+lookups instead of text-scanning XPaths.
+"""
+
+import os
+import re
+import threading
+from collections import deque
+from html.parser import HTMLParser
+
+_ID_SUFFIXES = ("-btn", "-button", "-input", "-select", "-field")
+_FIELD_TAGS = {"input", "select", "textarea"}
+_BUTTON_INPUT_TYPES = {"button", "submit", "reset"}
+_WHITESPACE = re.compile(r"\s+")
+
+# Words step descriptions use for buttons on templates/index.html that the DOM does not
+# spell out: ASCII "-" for the "−" button, "show/hide" for "Show Hidden Content", and so
+# on. Added only for locators the page has, after its own keywords, which win on ties.
+_BUTTON_SYNONYMS = {
+    "-": "id:decrement-btn",
+    "show/hide": "id:toggle-btn",
+    "show content": "id:toggle-btn",
+    "hide content": "id:toggle-btn",
+    "load": "id:delayed-btn",
+}
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def _text_locator(text: str) -> str | None:
+    """Return an exact-text XPath for a button without an id, or None if it has no usable text."""
+    text = _WHITESPACE.sub(" ", text).strip()
+    quote = "'" if "'" not in text else '"'
+    if not text or quote in text:
+        return None
+    return f"xpath://button[normalize-space()={quote}{text}{quote}]"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton finding every keyword occurrence in a text in one pass."""
+
+    def __init__(self, keywords):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[str]] = [[]]
+        for keyword in keywords:
+            self._add(keyword)
+        self._build()
+
+    def _add(self, keyword: str) -> None:
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(keyword)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str):
+        """Yield ``(start, keyword)`` for every keyword occurrence in ``text``."""
+        state = 0
+        for pos, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for keyword in self._out[state]:
+                yield pos - len(keyword) + 1, keyword
+
+
+class _KeywordTable:
+    """Keyword → locator table with a matching automaton."""
+
+    def __init__(self):
+        self.locators: dict[str, str] = {}
+        self._automaton = None
+
+    def add(self, keyword: str, locator: str) -> None:
+        keyword = _normalize(keyword)
+        if keyword and keyword not in self.locators:  # first element in document order wins
+            self.locators[keyword] = locator
+            self._automaton = None
+
+    def lookup(self, text: str) -> str | None:
+        """Return the locator of the longest keyword found in ``text`` at word boundaries.
+
+        Keywords must not be glued to letters or digits on either side, so that
+        ``-`` does not match inside "sign-up" nor ``load`` inside "download".
+        """
+        if not self.locators:
+            return None
+        if self._automaton is None:
+            self._automaton = KeywordAutomaton(self.locators)
+        text = _normalize(text)
+        best = None
+        for start, keyword in self._automaton.find(text):
+            end = start + len(keyword)
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalnum():
+                continue
+            if best is None or len(keyword) > len(best[1]) or (len(keyword) == len(best[1]) and start < best[0]):
+                best = (start, keyword)
+        return None if best is None else self.locators[best[1]]
+
+
+class _PageParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.elements: list[dict] = []  # {"kind", "id", "keywords", "text"}
+        self.labels: list[tuple[str | None, str]] = []  # (for id, text)
+        self._label = None  # [for_id, text parts, nested field id]
+        self._button = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        element_id = attrs.get("id")
+        if tag == "label":
+            self._label = [attrs.get("for"), [], None]
+            return
+
+        kind = None
+        if tag == "button" or (tag == "input" and attrs.get("type") in _BUTTON_INPUT_TYPES):
+            kind = "button"
+        elif tag in _FIELD_TAGS:
+            kind = "field"
+        # Buttons without an id can still be found by their text; other elements cannot.
+        if kind is None or not (element_id or tag == "button"):
+            return
+
+        element = {"kind": kind, "id": element_id, "keywords": [], "text": ""}
+        if element_id:
+            element["keywords"] += [element_id, element_id.replace("-", " ")]
+            for suffix in _ID_SUFFIXES:
+                if element_id.endswith(suffix):
+                    stem = element_id[: -len(suffix)]
+                    element["keywords"] += [stem, stem.replace("-", " ")]
+        for attr in ("placeholder", "value", "aria-label", "title"):
+            if attrs.get(attr) and (attr != "value" or kind == "button"):
+                element["keywords"].append(attrs[attr])
+        self.elements.append(element)
+
+        if tag == "button":
+            self._button = [element, []]
+        if element_id and self._label is not None and self._label[2] is None:
+            self._label[2] = element_id
+
+    def handle_endtag(self, tag):
+        if tag == "button" and self._button is not None:
+            element, parts = self._button
+            element["text"] = "".join(parts)
+            element["keywords"].append(element["text"])
+            self._button = None
+        elif tag == "label" and self._label is not None:
+            for_id, parts, nested_id = self._label
+            self.labels.append((for_id or nested_id, "".join(parts)))
+            self._label = None
+
+    def handle_data(self, data):
+        if self._button is not None:
+            self._button[1].append(data)
+        if self._label is not None:
+            self._label[1].append(data)
+
+
+class LocatorIndex:
+    """Field and button locator tables built from one HTML page."""
+
+    def __init__(self, html: str = ""):
+        self.fields = _KeywordTable()
+        self.buttons = _KeywordTable()
+        if not html:
+            return
+
+        parser = _PageParser()
+        parser.feed(html)
+        parser.close()
+
+        label_text = {}
+        for for_id, text in parser.labels:
+            if for_id:
+                label_text.setdefault(for_id, []).append(text)
+
+        for element in parser.elements:
+            table = self.buttons if element["kind"] == "button" else self.fields
+            if element["id"]:
+                locator = f"id:{element['id']}"
+            else:
+                locator = _text_locator(element["text"])
+                if locator is None:
+                    continue
+            for keyword in element["keywords"] + label_text.get(element["id"], []):
+                table.add(keyword, locator)
+
+        on_page = set(self.buttons.locators.values())
+        for keyword, locator in _BUTTON_SYNONYMS.items():
+            if locator in on_page:
+                self.buttons.add(keyword, locator)
+
+    def field(self, description: str) -> str | None:
+        return self.fields.lookup(description)
+
+    def button(self, description: str) -> str | None:
+        return self.buttons.lookup(description)
+
+
+_cache: dict[str, tuple[int, LocatorIndex]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_locator_index(page_path: str) -> LocatorIndex:
+    """Return the index for ``page_path``, rebuilding it only when the file changes."""
+    try:
+        mtime = os.stat(page_path).st_mtime_ns
+    except OSError:
+        return LocatorIndex()
+    with _cache_lock:
+        cached = _cache.get(page_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    with open(page_path, encoding="utf-8") as f:
+        index = LocatorIndex(f.read())
+    with _cache_lock:
+        _cache[page_path] = (mtime, index)
+    return index
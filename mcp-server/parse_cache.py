@@ -0,0 +1,133 @@
+"""
+Content-addressed cache of parsed KaneAI steps.
+
+Entries are looked up in two tiers:
+
+1. In memory by path: if the file's mtime and size are unchanged, the cached
+   steps are returned without opening the file.
+2. On disk by content hash: if the file changed on disk (or the process
+   restarted) but its bytes hash to a known digest, the stored steps are loaded
+   instead of re-parsing.
+
+Both tiers are bounded and evict least-recently-used entries. The parser
+version is part of the digest, so changing the parser invalidates old entries.
+Returned step lists are shared between callers and must not be mutated.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class ParseCache:
+    def __init__(
+        self,
+        parse,
+        cache_dir: str | None = None,
+        parser_version: str = "1",
+        max_entries: int = 256,
+        max_disk_entries: int = 2048,
+    ):
+        """
+        Args:
+            parse: Callable taking an iterable of text lines and returning a list of steps.
+            cache_dir: Directory for the on-disk tier; ``None`` or empty keeps the cache in memory only.
+            parser_version: Mixed into every content hash so parser changes invalidate entries.
+            max_entries: Maximum files kept in the in-memory tier.
+            max_disk_entries: Maximum files kept in the on-disk tier.
+        """
+        self.parse = parse
+        self.cache_dir = cache_dir or None
+        self.parser_version = parser_version
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        # realpath -> (mtime_ns, size, digest, steps)
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, path: str) -> list[dict]:
+        """Return the parsed steps of ``path``, parsing only when its content is new."""
+        key = os.path.realpath(path)
+        st = os.stat(key)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry[3]
+
+        with open(key, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(self.parser_version.encode() + b"\0" + data).hexdigest()
+
+        if entry is not None and entry[2] == digest:
+            steps = entry[3]  # touched but unchanged
+            self.stats["memory_hits"] += 1
+        else:
+            steps = self._load_disk(digest)
+            if steps is not None:
+                self.stats["disk_hits"] += 1
+            else:
+                self.stats["misses"] += 1
+                steps = self.parse(io.TextIOWrapper(io.BytesIO(data)))
+                self._store_disk(digest, steps)
+
+        with self._lock:
+            self._memory[key] = (st.st_mtime_ns, st.st_size, digest, steps)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return steps
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._memory.pop(os.path.realpath(path), None)
+
+    def _disk_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _load_disk(self, digest: str) -> list[dict] | None:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(digest)
+        try:
+            with open(path) as f:
+                steps = json.load(f)
+            os.utime(path)  # mark as recently used for eviction
+            return steps
+        except (OSError, ValueError):
+            return None
+
+    def _store_disk(self, digest: str, steps: list[dict]) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(digest)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(steps, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".json")]
+        except OSError:
+            return
+        overflow = len(entries) - self.max_disk_entries
+        if overflow <= 0:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime_ns)
+        for entry in entries[:overflow]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,69 @@
+"""
+Incremental index of Robot Framework test files and the test cases they define.
+
+Each refresh lists the directory and stats every ``.robot`` file, but only
+re-reads files whose mtime or size changed since the last refresh. Files
+that disappeared are dropped from the index.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+
+def parse_test_cases(lines) -> list[str]:
+    """Return the test case names defined in the ``*** Test Cases ***`` sections of a .robot file."""
+    test_cases = []
+    in_test_cases = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("*** Test Cases ***"):
+            in_test_cases = True
+            continue
+        if stripped.startswith("***"):
+            in_test_cases = False
+            continue
+        if in_test_cases and stripped and not line[0].isspace():
+            test_cases.append(stripped)
+    return test_cases
+
+
+class RobotTestIndex:
+    def __init__(self):
+        # tests_dir -> {path: (mtime_ns, size, test_cases)}
+        self._dirs: dict[str, dict[str, tuple[int, int, list[str]]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"parsed": 0, "reused": 0}
+
+    def refresh(self, tests_dir: str) -> list[dict]:
+        """Bring the index for ``tests_dir`` up to date and return its files sorted by path."""
+        with self._lock:
+            known = self._dirs.setdefault(tests_dir, {})
+            current = {}
+            base = Path(tests_dir)
+            with os.scandir(tests_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".robot") or not entry.is_file():
+                        continue
+                    path = str(base / entry.name)
+                    st = entry.stat()
+                    cached = known.get(path)
+                    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                        current[path] = cached
+                        self.stats["reused"] += 1
+                        continue
+                    with open(path) as f:
+                        test_cases = parse_test_cases(f)
+                    current[path] = (st.st_mtime_ns, st.st_size, test_cases)
+                    self.stats["parsed"] += 1
+            self._dirs[tests_dir] = current
+
+        return [
+            {
+                "file": path,
+                "filename": os.path.basename(path),
+                "test_cases": test_cases,
+                "test_count": len(test_cases),
+            }
+            for path, (_, _, test_cases) in sorted(current.items())
+        ]
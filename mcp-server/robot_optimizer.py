@@ -0,0 +1,109 @@
+"""
+Peephole optimizer for generated Robot Framework keyword lines.
+
+KaneAI scripts often check the same element several times in a row (a
+"verify" step waiting for visibility, then an "assert" step waiting again and
+reading its text). The optimizer keeps what a test verifies but removes the
+repeated work:
+
+* a visibility wait or check on a locator already known to be visible is dropped;
+* a ``Wait Until Element Is Visible`` directly before ``Wait And Verify Text``
+  on the same locator is dropped, since the latter waits itself;
+* a ``Wait Until Element Is Visible`` directly followed by
+  ``Element Should Contain`` on the same locator is merged into
+  ``Wait And Verify Text``;
+* an observation repeated verbatim is dropped.
+
+"Known visible" lasts until the next keyword that may change the page
+(anything that is not a pure observation, such as a click, input or
+navigation). Comment lines are kept unless ``drop_comments`` is set, except
+that a ``# Step N:`` comment (and any other comment of that step) is dropped
+when every keyword of its step was removed, so no comment labels nothing.
+"""
+
+import re
+
+_SEPARATOR = re.compile(r" {2,}|\t")
+_STEP_COMMENT = re.compile(r"#\s*Step\s+\d+")
+
+# Timeout used by the Wait And Verify Text keyword in tests/resources.robot.
+WAIT_AND_VERIFY_TIMEOUT = "timeout=5s"
+
+_WAIT_VISIBLE = "wait until element is visible"
+_SHOULD_BE_VISIBLE = "element should be visible"
+_SHOULD_CONTAIN = "element should contain"
+_WAIT_AND_VERIFY = "wait and verify text"
+
+# Keywords that only observe the page; every other keyword may change it.
+_OBSERVING = {
+    _WAIT_VISIBLE,
+    _SHOULD_BE_VISIBLE,
+    _SHOULD_CONTAIN,
+    _WAIT_AND_VERIFY,
+    "element text should be",
+    "textfield value should be",
+    "page should contain",
+    "page should contain element",
+    "title should be",
+}
+_PROVES_VISIBLE = {_WAIT_VISIBLE, _SHOULD_BE_VISIBLE, _WAIT_AND_VERIFY}
+
+
+def _tokens(line: str) -> list[str]:
+    return _SEPARATOR.split(line.strip())
+
+
+def optimize_keywords(lines: list[str], drop_comments: bool = False) -> list[str]:
+    """Return ``lines`` with redundant waits and checks removed."""
+    out: list[str] = []
+    steps: list[int] = []  # step group of each line in ``out``
+    had_keywords: set[int] = set()  # step groups with at least one keyword in ``lines``
+    visible: set[str] = set()
+    last = None  # index in ``out`` of the previous keyword line
+    step = 0
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            if _STEP_COMMENT.match(stripped):
+                step += 1
+            if not drop_comments:
+                out.append(line)
+                steps.append(step)
+            continue
+
+        had_keywords.add(step)
+        tokens = _tokens(line)
+        name = tokens[0].lower()
+        if name not in _OBSERVING:
+            visible.clear()
+            out.append(line)
+            steps.append(step)
+            last = len(out) - 1
+            continue
+
+        locator = tokens[1] if len(tokens) > 1 else ""
+        prev = _tokens(out[last]) if last is not None else []
+        prev_is_wait = bool(prev) and prev[0].lower() == _WAIT_VISIBLE and prev[1:] == [locator, WAIT_AND_VERIFY_TIMEOUT]
+
+        if name in (_WAIT_VISIBLE, _SHOULD_BE_VISIBLE) and locator in visible:
+            continue
+        if prev == tokens:
+            continue
+        if name == _SHOULD_CONTAIN and prev_is_wait and len(tokens) == 3:
+            indent = out[last][: len(out[last]) - len(out[last].lstrip())]
+            out[last] = f"{indent}Wait And Verify Text    {locator}    {tokens[2]}"
+            continue
+        if name == _WAIT_AND_VERIFY and prev_is_wait:
+            del out[last]
+            del steps[last]
+
+        out.append(line)
+        steps.append(step)
+        last = len(out) - 1
+        if name in _PROVES_VISIBLE:
+            visible.add(locator)
+
+    kept = {n for line, n in zip(out, steps) if line.strip() and not line.strip().startswith("#")}
+    emptied = had_keywords - kept - {0}
+    return [line for line, n in zip(out, steps) if n not in emptied]
@@ -4,28 +4,58 @@ MCP Server: KaneAI Selenium/Python → Robot Framework Migration
 This server exposes tools that:
 1. Analyze KaneAI-generated Selenium/Python test scripts
 2. Extract test steps and map them to Robot Framework keywords
-3. Generate .robot files that reuse existing shared resources
+3. Generate .robot files that reuse existing shared resources, one script or a whole directory at a time,
+   or merge many scripts into suites that share one browser session
 4. List existing Robot Framework tests for context
 """
 
 import os
 import re
 import json
+import time
+import hashlib
+import asyncio
+import logging
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
+from locator_index import LocatorIndex, load_locator_index
+from parse_cache import ParseCache
+from robot_index import RobotTestIndex
+from robot_optimizer import optimize_keywords
+
 PROJECT_ROOT = os.environ.get(
     "PROJECT_ROOT",
     str(Path(__file__).resolve().parent.parent),
 )
 
+DEFAULT_PAGE_PATH = os.path.join(PROJECT_ROOT, "templates", "index.html")
+
+# Bump whenever _iter_steps output changes so cached parses are invalidated.
+PARSER_VERSION = "1"
+
+# Concurrent tool calls per lane. Migrations and analysis run on the "heavy"
+# lane; list_* calls get their own lane so they stay responsive meanwhile.
+HEAVY_TOOL_WORKERS = int(os.environ.get("MCP_HEAVY_WORKERS", "2"))
+LIGHT_TOOL_WORKERS = int(os.environ.get("MCP_LIGHT_WORKERS", "4"))
+
+# FastMCP routes logging to stderr; stdout carries the stdio transport.
+logger = logging.getLogger("kaneai-to-robot")
+
 mcp = FastMCP(
     "kaneai-to-robot",
     instructions=(
         "MCP server for migrating KaneAI-generated Selenium/Python test scripts "
         "to Robot Framework format. Use 'analyze_kaneai_script' to parse a script, "
-        "'migrate_to_robot' to convert it, and 'list_robot_tests' to see existing tests."
+        "'migrate_to_robot' to convert it, 'migrate_directory' to convert a whole folder, "
+        "'migrate_to_suite' to merge scripts into shared-browser suites, "
+        "and 'list_robot_tests' to see existing tests."
     ),
 )
 
@@ -33,54 +63,106 @@ mcp = FastMCP(
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
 
+_STEP_RE = re.compile(r"#\s*Step\s*-\s*(\d+)\s*:\s*(.*)")
+_STEP_START_RE = re.compile(r"#\s*Step\s*-\s*\d+")
+_URL_RE = re.compile(r'driver\.get\(["\'](.+?)["\']\)')
+_KEYS_RE = re.compile(r"send_keys\(['\"](.+?)['\"]\)")
+_FIELD_RE = re.compile(r"(?:in|into)\s+(\w+(?:\s+\w+)*)\s+(?:input\s+)?field", re.IGNORECASE)
+_EXPECTED_RE = re.compile(r"equals?\s+(.+?)$", re.IGNORECASE)
+_ARROW_VAR_RE = re.compile(r"→\s*\{\{(\w+)\}\}")
+_VAR_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+def _iter_steps(lines):
+    """Yield structured steps from an iterable of script lines in a single pass.
+
+    ``lines`` may be an open file handle, so the script never has to be held in
+    memory as a whole. A step runs from its ``# Step - N : ...`` comment to the
+    next step comment; URL and ``send_keys`` values are picked up as its code
+    lines stream past.
+    """
+    step = None  # [step_num, description, code_lines, url, value]
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        if line[0] == "#":
+            if _STEP_START_RE.match(line):
+                if step is not None:
+                    yield _build_step(*step)
+                m = _STEP_RE.match(line)
+                # A malformed step comment still ends the previous step but starts none.
+                step = [int(m.group(1)), m.group(2).strip(), [], None, None] if m else None
+            continue
+        if step is None:
+            continue
+
+        step[2].append(line)
+        if "driver.get(" in line:
+            url_match = _URL_RE.search(line)
+            if url_match:
+                step[3] = url_match.group(1)
+        if "send_keys(" in line:
+            keys_match = _KEYS_RE.search(line)
+            if keys_match:
+                step[4] = keys_match.group(1)
+
+    if step is not None:
+        yield _build_step(*step)
+
+
+def _build_step(step_num: int, description: str, code_lines: list[str], url, value) -> dict:
+    code_lower = " ".join(code_lines).lower()
+    return {
+        "step": step_num,
+        "description": description,
+        "code": "\n".join(code_lines),
+        "type": _classify_step(description, code_lower),
+        "data": _extract_data(description, url, value),
+    }
+
+
 def _extract_steps(source: str) -> list[dict]:
     """Parse KaneAI script comments and code blocks into structured steps."""
-    steps = []
-    lines = source.split("\n")
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        # Match step comments like: # Step - 1 : Go to https://...
-        m = re.match(r"#\s*Step\s*-\s*(\d+)\s*:\s*(.*)", line)
-        if m:
-            step_num = int(m.group(1))
-            description = m.group(2).strip()
-
-            # Collect associated code lines until next step or end
-            code_lines = []
-            i += 1
-            while i < len(lines):
-                next_line = lines[i].strip()
-                if re.match(r"#\s*Step\s*-\s*\d+", next_line):
-                    break
-                if next_line and not next_line.startswith("#"):
-                    code_lines.append(next_line)
-                i += 1
-
-            step = {
-                "step": step_num,
-                "description": description,
-                "code": "\n".join(code_lines),
-                "type": _classify_step(description, code_lines),
-            }
-            # Extract data values from the step
-            step["data"] = _extract_data(description, code_lines)
-            steps.append(step)
-        else:
-            i += 1
-    return steps
+    return list(_iter_steps(source.split("\n")))
+
 
+def _read_steps(path: str) -> list[dict]:
+    """Parse a KaneAI script file, streaming it line by line."""
+    with open(path) as f:
+        return list(_iter_steps(f))
+
+
+_parse_cache = ParseCache(
+    lambda lines: list(_iter_steps(lines)),
+    cache_dir=os.environ.get("KANEAI_CACHE_DIR", os.path.join(PROJECT_ROOT, ".kaneai-cache")),
+    parser_version=PARSER_VERSION,
+)
 
-def _classify_step(description: str, code_lines: list[str]) -> str:
-    """Classify a step into a category for Robot Framework mapping."""
+
+_robot_index = RobotTestIndex()
+
+
+def _load_steps(path: str) -> list[dict]:
+    """Return the parsed steps of a script, reusing cached results for unchanged content.
+
+    The returned list is shared with the cache and must not be mutated.
+    """
+    return _parse_cache.get(path)
+
+
+def _classify_step(description: str, code_lower: str) -> str:
+    """Classify a step into a category for Robot Framework mapping.
+
+    ``code_lower`` is the step's code lines joined with spaces and lowercased.
+    """
     desc_lower = description.lower()
-    code_joined = " ".join(code_lines).lower()
 
-    if "go to" in desc_lower or "driver.get(" in code_joined:
+    if "go to" in desc_lower or "driver.get(" in code_lower:
         return "navigate"
-    if "click" in desc_lower and ("button" in desc_lower or "click()" in code_joined):
+    if "click" in desc_lower and ("button" in desc_lower or "click()" in code_lower):
         return "click"
-    if "type" in desc_lower or "send_keys(" in code_joined:
+    if "type" in desc_lower or "send_keys(" in code_lower:
         return "input"
     if "assert" in desc_lower:
         return "assert"
@@ -88,93 +170,69 @@ def _classify_step(description: str, code_lines: list[str]) -> str:
         return "verify"
     if "select" in desc_lower:
         return "select"
-    if "vision model" in code_joined:
+    if "vision model" in code_lower:
         return "vision_placeholder"
     return "other"
 
 
-def _extract_data(description: str, code_lines: list[str]) -> dict:
-    """Extract relevant data values from step description and code."""
+def _extract_data(description: str, url: str | None = None, value: str | None = None) -> dict:
+    """Collect data values for a step from its description and the values found in its code."""
     data = {}
-
-    # Extract URL from driver.get()
-    for line in code_lines:
-        url_match = re.search(r'driver\.get\(["\'](.+?)["\']\)', line)
-        if url_match:
-            data["url"] = url_match.group(1)
-
-    # Extract send_keys value
-    for line in code_lines:
-        keys_match = re.search(r"send_keys\(['\"](.+?)['\"]\)", line)
-        if keys_match:
-            data["value"] = keys_match.group(1)
+    if url is not None:
+        data["url"] = url
+    if value is not None:
+        data["value"] = value
 
     # Extract field name from description
-    field_match = re.search(r"(?:in|into)\s+(\w+(?:\s+\w+)*)\s+(?:input\s+)?field", description, re.IGNORECASE)
+    field_match = _FIELD_RE.search(description)
     if field_match:
         data["field"] = field_match.group(1)
 
     # Extract expected value from Assert descriptions
-    assert_match = re.search(r"equals?\s+(.+?)$", description, re.IGNORECASE)
+    assert_match = _EXPECTED_RE.search(description)
     if assert_match:
         data["expected"] = assert_match.group(1).strip()
 
     # Extract variable name from → {{var}} or Assert {{var}}
-    var_match = re.search(r"→\s*\{\{(\w+)\}\}", description)
+    var_match = _ARROW_VAR_RE.search(description) or _VAR_RE.search(description)
     if var_match:
         data["variable"] = var_match.group(1)
-    else:
-        var_match2 = re.search(r"\{\{(\w+)\}\}", description)
-        if var_match2:
-            data["variable"] = var_match2.group(1)
 
     return data
 
 
-def _map_field_to_locator(field_name: str) -> str:
+def _resolve_page_path(page_path: str = "") -> str:
+    if not page_path:
+        return DEFAULT_PAGE_PATH
+    if not os.path.isabs(page_path):
+        return os.path.join(PROJECT_ROOT, page_path)
+    return page_path
+
+
+def _page_locators(page_path: str = "") -> LocatorIndex:
+    """Return the locator index of the target page (defaults to templates/index.html)."""
+    return load_locator_index(_resolve_page_path(page_path))
+
+
+def _map_field_to_locator(field_name: str, locators: LocatorIndex | None = None) -> str:
     """Map KaneAI field descriptions to element locators."""
-    mapping = {
-        "username": "id:username",
-        "password": "id:password",
-        "greet-name": "id:greet-name",
-        "search": "id:search-input",
-        "modal": "id:modal-input",
-        "color": "id:color-select",
-    }
-    field_lower = field_name.lower()
-    for key, locator in mapping.items():
-        if key in field_lower:
-            return locator
-    return f"id:{field_lower.replace(' ', '-')}"
+    locators = locators or _page_locators()
+    locator = locators.field(field_name)
+    if locator:
+        return locator
+    return f"id:{field_name.lower().replace(' ', '-')}"
 
 
-def _map_button_to_locator(description: str) -> str:
+def _map_button_to_locator(description: str, locators: LocatorIndex | None = None) -> str:
     """Map KaneAI button descriptions to element locators."""
-    desc_lower = description.lower()
-    if "login" in desc_lower:
-        return "id:login-btn"
-    if "greet" in desc_lower:
-        return "id:greet-btn"
-    if "modal" in desc_lower and "open" in desc_lower:
-        return "id:open-modal-btn"
-    if "modal" in desc_lower and ("close" in desc_lower or "cancel" in desc_lower):
-        return "id:close-modal-btn"
-    if "confirm" in desc_lower:
-        return "id:modal-confirm-btn"
-    if "increment" in desc_lower or "+" in desc_lower:
-        return "id:increment-btn"
-    if "decrement" in desc_lower or "-" in desc_lower:
-        return "id:decrement-btn"
-    if "reset" in desc_lower:
-        return "id:reset-btn"
-    if "toggle" in desc_lower or "show" in desc_lower or "hide" in desc_lower:
-        return "id:toggle-btn"
-    if "delayed" in desc_lower or "load" in desc_lower:
-        return "id:delayed-btn"
+    locators = locators or _page_locators()
+    locator = locators.button(description)
+    if locator:
+        return locator
     return f"xpath://button[contains(text(), '{description}')]"
 
 
-def _step_to_robot_keyword(step: dict, url_var: bool = True) -> list[str]:
+def _step_to_robot_keyword(step: dict, url_var: bool = True, locators: LocatorIndex | None = None) -> list[str]:
     """Convert a parsed step into Robot Framework keyword lines."""
     stype = step["type"]
     desc = step["description"]
@@ -189,14 +247,14 @@ def _step_to_robot_keyword(step: dict, url_var: bool = True) -> list[str]:
     if stype == "input":
         value = data.get("value", "")
         field = data.get("field", "")
-        locator = _map_field_to_locator(field)
+        locator = _map_field_to_locator(field, locators)
         lines = []
         if value:
             lines.append(f"    Input Text    {locator}    {value}")
         return lines
 
     if stype == "click":
-        locator = _map_button_to_locator(desc)
+        locator = _map_button_to_locator(desc, locators)
         return [f"    Click Button    {locator}"]
 
     if stype == "assert":
@@ -237,39 +295,394 @@ def _step_to_robot_keyword(step: dict, url_var: bool = True) -> list[str]:
     return [f"    # {desc}"]
 
 
-def _steps_to_robot(test_name: str, steps: list[dict], doc: str = "") -> str:
-    """Convert a list of steps into a complete Robot Framework test case."""
+def _steps_to_robot(
+    test_name: str,
+    steps: list[dict],
+    doc: str = "",
+    locators: LocatorIndex | None = None,
+    optimize: bool = False,
+    drop_comments: bool = False,
+) -> str:
+    """Convert a list of steps into a complete Robot Framework test case.
+
+    With ``optimize`` the keyword lines pass through the optimizer, which removes
+    redundant waits and checks (and comments when ``drop_comments`` is set).
+    """
     keyword_lines = []
     for step in steps:
-        robot_lines = _step_to_robot_keyword(step)
+        robot_lines = _step_to_robot_keyword(step, locators=locators)
         if robot_lines:
             keyword_lines.append(f"    # Step {step['step']}: {step['description']}")
             keyword_lines.extend(robot_lines)
+    if optimize:
+        keyword_lines = optimize_keywords(keyword_lines, drop_comments)
 
     doc_line = f"\n    [Documentation]    {doc}" if doc else ""
     body = "\n".join(keyword_lines)
     return f"{test_name}{doc_line}\n{body}"
 
 
+def _derive_test_name(path: str) -> str:
+    """Convert kaneai_login_test_positive → KaneAI Login Test Positive."""
+    return " ".join(
+        word.capitalize() if word != "kaneai" else "KaneAI"
+        for word in Path(path).stem.split("_")
+    )
+
+
+def _migrate_file(
+    full_path: str,
+    test_name: str = "",
+    documentation: str = "",
+    output_path: str = "",
+    page_path: str = "",
+    optimize: bool = True,
+    drop_comments: bool = False,
+) -> dict:
+    """Parse one KaneAI script, write its .robot file and describe the result."""
+    steps = _load_steps(full_path)
+
+    # Derive test name from filename if not provided
+    if not test_name:
+        test_name = _derive_test_name(full_path)
+
+    # Generate the test case body
+    test_case = _steps_to_robot(
+        test_name, steps, documentation, _page_locators(page_path), optimize, drop_comments
+    )
+
+    # Build the full .robot file
+    robot_content = f"""*** Settings ***
+Resource    resources.robot
+Suite Setup    Open Test Browser
+Suite Teardown    Close Test Browser
+
+*** Test Cases ***
+
+{test_case}
+"""
+
+    # Determine output path
+    if not output_path:
+        output_path = os.path.join(PROJECT_ROOT, "tests", Path(full_path).stem + ".robot")
+    elif not os.path.isabs(output_path):
+        output_path = os.path.join(PROJECT_ROOT, output_path)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as f:
+        f.write(robot_content)
+
+    return {
+        "input_file": full_path,
+        "output_file": output_path,
+        "test_name": test_name,
+        "total_steps_parsed": len(steps),
+        "robot_content": robot_content,
+    }
+
+
+SUITE_HEADER = """*** Settings ***
+Resource    {resource}
+Suite Setup    Open Test Browser
+Suite Teardown    Close Test Browser
+Test Setup    Go To    ${{URL}}
+
+*** Test Cases ***
+"""
+
+
+def _suite_test_case(
+    full_path: str,
+    test_name: str,
+    locators: LocatorIndex,
+    optimize: bool = True,
+    drop_comments: bool = False,
+) -> tuple[str, int, int]:
+    """Build one test case for a shared-browser suite; return its text, parsed and emitted step counts."""
+    parsed = _load_steps(full_path)
+    steps = parsed
+    # Test Setup already loads ${URL}, so a leading navigation to it would only reload the page.
+    for i, step in enumerate(steps):
+        lines = _step_to_robot_keyword(step, locators=locators)
+        if not lines:
+            continue
+        if lines == ["    Go To    ${URL}"]:
+            steps = steps[:i] + steps[i + 1:]
+        break
+    return _steps_to_robot(test_name, steps, "", locators, optimize, drop_comments), len(parsed), len(steps)
+
+
+def _unique_name(name: str, used: set[str]) -> str:
+    candidate, n = name, 1
+    while candidate.lower() in used:
+        n += 1
+        candidate = f"{name} {n}"
+    used.add(candidate.lower())
+    return candidate
+
+
+def _migrate_job(job: tuple[str, str, str, bool, bool]) -> dict:
+    """Process-pool entry point for migrate_directory: migrate one script and time it."""
+    input_file, output_path, page_path, optimize, drop_comments = job
+    started = time.perf_counter()
+    try:
+        result = _migrate_file(
+            input_file,
+            output_path=output_path,
+            page_path=page_path,
+            optimize=optimize,
+            drop_comments=drop_comments,
+        )
+    except Exception as e:  # report per-file failures instead of aborting the batch
+        return {
+            "input_file": input_file,
+            "output_file": output_path,
+            "status": "failed",
+            "error": f"{type(e).__name__}: {e}",
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    return {
+        "input_file": input_file,
+        "output_file": output_path,
+        "status": "migrated",
+        "test_name": result["test_name"],
+        "total_steps_parsed": result["total_steps_parsed"],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_size = 0
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Return a process pool that is kept between calls, so worker start-up is paid once.
+
+    The size comes from the ``workers`` setting only, never from a call's job
+    count, so the warm pool is replaced only when a different size is asked for.
+    """
+    global _process_pool, _process_pool_size
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_size != workers:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False)
+            # spawn avoids forking the server's event-loop threads into workers.
+            context = multiprocessing.get_context("spawn")
+            _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _process_pool_size = workers
+        return _process_pool
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a pool whose worker died, so the next call starts a fresh one."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False)
+
+
+def _map_in_pool(fn, jobs: list, workers: int) -> list:
+    """``fn`` over ``jobs`` in the shared pool, retried once on a fresh pool if a worker dies."""
+    chunksize = max(1, len(jobs) // (workers * 4))
+    for attempt in range(2):
+        pool = _get_process_pool(workers)
+        try:
+            return list(pool.map(fn, jobs, chunksize=chunksize))
+        except BrokenProcessPool:
+            _discard_process_pool(pool)
+            if attempt:
+                raise
+            logger.warning("process pool broke; retrying on a fresh pool")
+
+
+# Sidecar in each migrate_directory output directory: output file name -> fingerprint of
+# the options and page it was generated with.
+MIGRATION_MANIFEST = ".kaneai-migrate.json"
+_manifest_lock = threading.Lock()
+
+
+def _migration_fingerprint(page_path: str, optimize: bool, drop_comments: bool) -> str:
+    """Hash everything besides the script itself that shapes a generated .robot file."""
+    try:
+        with open(_resolve_page_path(page_path), "rb") as f:
+            page_digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        page_digest = ""
+    key = json.dumps([PARSER_VERSION, page_digest, bool(optimize), bool(drop_comments)])
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _load_manifest(output_dir: str) -> dict[str, str]:
+    try:
+        with open(os.path.join(output_dir, MIGRATION_MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _update_manifest(output_dir: str, files: list[dict], fingerprint: str) -> None:
+    """Record the fingerprint of freshly migrated outputs and forget failed ones."""
+    with _manifest_lock:
+        manifest = _load_manifest(output_dir)
+        for f in files:
+            name = os.path.basename(f["output_file"])
+            if f["status"] == "migrated":
+                manifest[name] = fingerprint
+            elif f["status"] == "failed":
+                manifest.pop(name, None)
+        path = os.path.join(output_dir, MIGRATION_MANIFEST)
+        with open(path + ".tmp", "w") as out:
+            json.dump(manifest, out, indent=2, sort_keys=True)
+            out.write("\n")
+        os.replace(path + ".tmp", path)
+
+
+def _is_up_to_date(source: str, output: str, recorded: str | None, fingerprint: str) -> bool:
+    """True if ``output`` is newer than ``source`` and was generated with the same options and page."""
+    if recorded != fingerprint:
+        return False
+    try:
+        return os.stat(output).st_mtime_ns >= os.stat(source).st_mtime_ns
+    except OSError:
+        return False
+
+
+STEP_FIELDS = ("step", "description", "code", "type", "data")
+
+
+def _parse_fields(fields: str) -> tuple[str, ...] | None:
+    """Parse a comma-separated step field list; ``None`` means all fields."""
+    selected = tuple(f.strip() for f in fields.split(",") if f.strip())
+    unknown = [f for f in selected if f not in STEP_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown step fields: {', '.join(unknown)}. Valid fields: {', '.join(STEP_FIELDS)}")
+    return selected or None
+
+
+def _page_steps(steps: list[dict], fields: tuple[str, ...] | None, offset: int = 0, limit: int = 0) -> list[dict]:
+    """Return one page of steps, projected to ``fields`` when given."""
+    page = steps[offset:offset + limit] if limit else steps[offset:]
+    if fields is None:
+        return page
+    return [{f: s[f] for f in fields} for s in page]
+
+
+def _dumps(payload: dict, compact: bool = False) -> str:
+    if compact:
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(payload, indent=2)
+
+
+def _resolve_dir(path: str, default: str) -> str:
+    if not path:
+        return os.path.join(PROJECT_ROOT, default)
+    return path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
+class _ToolLane:
+    """A bounded thread pool plus a semaphore capping how many calls run at once."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"mcp-{name}")
+        self._slots: asyncio.Semaphore | None = None
+
+    async def run(self, fn, /, **kwargs):
+        """Run ``fn(**kwargs)`` on the pool; return ``(result, queued_seconds, run_seconds)``."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        queued = time.perf_counter()
+        async with self._slots:
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, functools.partial(fn, **kwargs))
+            return result, started - queued, time.perf_counter() - started
+
+
+_heavy_lane = _ToolLane("heavy", HEAVY_TOOL_WORKERS)
+_light_lane = _ToolLane("light", LIGHT_TOOL_WORKERS)
+
+_tool_timings: dict[str, dict] = {}
+_tool_timings_lock = threading.Lock()
+
+
+def _record_timing(name: str, lane: str, queued: float, elapsed: float, ok: bool) -> None:
+    with _tool_timings_lock:
+        t = _tool_timings.setdefault(
+            name, {"lane": lane, "calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "queued_ms": 0.0}
+        )
+        t["calls"] += 1
+        t["errors"] += 0 if ok else 1
+        t["total_ms"] += elapsed * 1000
+        t["max_ms"] = max(t["max_ms"], elapsed * 1000)
+        t["queued_ms"] += queued * 1000
+    logger.info(
+        "%s lane=%s queued=%.1fms run=%.1fms%s", name, lane, queued * 1000, elapsed * 1000, "" if ok else " failed"
+    )
+
+
+def _async_tool(lane: _ToolLane):
+    """Register a synchronous tool implementation as an async MCP tool running on ``lane``.
+
+    The decorated function itself is returned unchanged, so it can still be
+    called directly from Python.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def tool(**kwargs):
+            queued = time.perf_counter()
+            try:
+                result, waited, elapsed = await lane.run(fn, **kwargs)
+            except Exception:
+                _record_timing(fn.__name__, lane.name, 0.0, time.perf_counter() - queued, ok=False)
+                raise
+            _record_timing(fn.__name__, lane.name, waited, elapsed, ok=True)
+            return result
+
+        mcp.tool()(tool)
+        return fn
+
+    return decorator
+
+
 # ── MCP Tools ────────────────────────────────────────────────────────────────
 
 
-@mcp.tool()
-def analyze_kaneai_script(file_path: str) -> str:
+@_async_tool(_heavy_lane)
+def analyze_kaneai_script(
+    file_path: str,
+    summary: bool = False,
+    fields: str = "",
+    step_offset: int = 0,
+    step_limit: int = 0,
+    compact: bool = False,
+) -> str:
     """Analyze a KaneAI-generated Selenium/Python script and extract structured test steps.
 
     Args:
         file_path: Path to the KaneAI Python script (absolute or relative to project root)
+        summary: Return only counts and step types, without the steps themselves
+        fields: Comma-separated step fields to include (step, description, code, type, data); default all
+        step_offset: Number of steps to skip
+        step_limit: Maximum number of steps to return (0 returns all)
+        compact: Emit JSON without indentation or extra whitespace
     """
     full_path = file_path if os.path.isabs(file_path) else os.path.join(PROJECT_ROOT, file_path)
 
     if not os.path.exists(full_path):
         return json.dumps({"error": f"File not found: {full_path}"})
 
-    with open(full_path) as f:
-        source = f.read()
+    try:
+        selected = _parse_fields(fields)
+    except ValueError as e:
+        return json.dumps({"error": str(e)})
 
-    steps = _extract_steps(source)
+    steps = _load_steps(full_path)
 
     # Extract test metadata
     test_name = Path(full_path).stem
@@ -284,21 +697,29 @@ def analyze_kaneai_script(file_path: str) -> str:
         "vision_placeholder_steps": len(steps) - len(actionable_steps),
         "has_vision_steps": has_vision_steps,
         "step_types": {},
-        "steps": steps,
     }
 
     for s in steps:
         result["step_types"][s["type"]] = result["step_types"].get(s["type"], 0) + 1
 
-    return json.dumps(result, indent=2)
+    if not summary:
+        if step_offset or step_limit:
+            result["step_offset"] = step_offset
+            result["step_limit"] = step_limit
+        result["steps"] = _page_steps(steps, selected, step_offset, step_limit)
 
+    return _dumps(result, compact)
 
-@mcp.tool()
+
+@_async_tool(_heavy_lane)
 def migrate_to_robot(
     file_path: str,
     test_name: str = "",
     documentation: str = "",
     output_path: str = "",
+    page_path: str = "",
+    optimize: bool = True,
+    drop_comments: bool = False,
 ) -> str:
     """Migrate a KaneAI Selenium/Python script to a Robot Framework .robot test case.
 
@@ -307,149 +728,285 @@ def migrate_to_robot(
         test_name: Name for the Robot test case (defaults to derived from filename)
         documentation: Documentation string for the test case
         output_path: Where to save the .robot file (defaults to tests/ folder)
+        page_path: HTML page whose element ids are used as locators (defaults to templates/index.html)
+        optimize: Remove redundant waits and checks from the generated keywords
+        drop_comments: Also drop step comments from the generated keywords
     """
     full_path = file_path if os.path.isabs(file_path) else os.path.join(PROJECT_ROOT, file_path)
 
     if not os.path.exists(full_path):
         return json.dumps({"error": f"File not found: {full_path}"})
 
-    with open(full_path) as f:
-        source = f.read()
-
-    steps = _extract_steps(source)
+    result = _migrate_file(full_path, test_name, documentation, output_path, page_path, optimize, drop_comments)
+    return json.dumps({"status": "success", **result}, indent=2)
 
-    # Derive test name from filename if not provided
-    if not test_name:
-        stem = Path(full_path).stem
-        # Convert kaneai_login_test_positive → KaneAI Login Test Positive
-        test_name = " ".join(
-            word.capitalize() if word != "kaneai" else "KaneAI"
-            for word in stem.split("_")
-        )
 
-    # Generate the test case body
-    test_case = _steps_to_robot(test_name, steps, documentation)
-
-    # Build the full .robot file
-    robot_content = f"""*** Settings ***
-Resource    resources.robot
-Suite Setup    Open Test Browser
-Suite Teardown    Close Test Browser
+@_async_tool(_heavy_lane)
+def migrate_directory(
+    scripts_dir: str = "",
+    output_dir: str = "",
+    pattern: str = "*.py",
+    workers: int = 0,
+    force: bool = False,
+    page_path: str = "",
+    optimize: bool = True,
+    drop_comments: bool = False,
+) -> str:
+    """Migrate every KaneAI script in a directory to .robot files using a process pool.
 
-*** Test Cases ***
+    Scripts whose .robot output is newer than the script, and was generated with the same
+    options and page, are skipped unless ``force`` is set.
 
-{test_case}
-"""
+    Args:
+        scripts_dir: Directory of KaneAI scripts (defaults to kane-ai-generated/)
+        output_dir: Directory for the .robot files (defaults to tests/)
+        pattern: Glob pattern selecting scripts within scripts_dir
+        workers: Worker processes (defaults to the CPU count)
+        force: Regenerate outputs even when they are up to date
+        page_path: HTML page whose element ids are used as locators (defaults to templates/index.html)
+        optimize: Remove redundant waits and checks from the generated keywords
+        drop_comments: Also drop step comments from the generated keywords
+    """
+    started = time.perf_counter()
+    scripts_dir = _resolve_dir(scripts_dir, "kane-ai-generated")
+    output_dir = _resolve_dir(output_dir, "tests")
 
-    # Determine output path
-    if not output_path:
-        output_path = os.path.join(PROJECT_ROOT, "tests", Path(full_path).stem + ".robot")
-    elif not os.path.isabs(output_path):
-        output_path = os.path.join(PROJECT_ROOT, output_path)
+    if not os.path.isdir(scripts_dir):
+        return json.dumps({"error": f"Directory not found: {scripts_dir}"})
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, "w") as f:
-        f.write(robot_content)
+    fingerprint = _migration_fingerprint(page_path, optimize, drop_comments)
+    manifest = _load_manifest(output_dir)
+    jobs, files = [], []
+    for script in sorted(Path(scripts_dir).glob(pattern)):
+        output_path = os.path.join(output_dir, script.stem + ".robot")
+        recorded = manifest.get(os.path.basename(output_path))
+        if not force and _is_up_to_date(str(script), output_path, recorded, fingerprint):
+            files.append({"input_file": str(script), "output_file": output_path, "status": "up_to_date"})
+        else:
+            jobs.append((str(script), output_path, page_path, optimize, drop_comments))
 
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or len(jobs) <= 1:
+        results = [_migrate_job(job) for job in jobs]
+    else:
+        try:
+            results = _map_in_pool(_migrate_job, jobs, workers)
+        except BrokenProcessPool as exc:
+            return json.dumps({"error": f"Worker process died: {exc}"})
+    if results:
+        os.makedirs(output_dir, exist_ok=True)
+        _update_manifest(output_dir, results, fingerprint)
+    files.extend(results)
+
+    files.sort(key=lambda f: f["input_file"])
+    counts = {status: sum(1 for f in files if f["status"] == status) for status in ("migrated", "up_to_date", "failed")}
     return json.dumps(
         {
-            "status": "success",
-            "input_file": full_path,
-            "output_file": output_path,
-            "test_name": test_name,
-            "total_steps_parsed": len(steps),
-            "robot_content": robot_content,
+            "scripts_dir": scripts_dir,
+            "output_dir": output_dir,
+            "workers": min(workers, len(jobs)),
+            "total_scripts": len(files),
+            **counts,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "files": files,
         },
         indent=2,
     )
 
 
-@mcp.tool()
-def list_robot_tests(tests_dir: str = "") -> str:
-    """List all existing Robot Framework test files and their test cases.
+@_async_tool(_heavy_lane)
+def migrate_to_suite(
+    scripts_dir: str = "",
+    output_path: str = "",
+    pattern: str = "*.py",
+    max_tests_per_suite: int = 0,
+    page_path: str = "",
+    optimize: bool = True,
+    drop_comments: bool = False,
+) -> str:
+    """Merge many KaneAI scripts into one or a few .robot suites that share a single browser session.
+
+    Each suite opens the browser once in Suite Setup and resets to ${URL} in Test Setup, so
+    tests stay isolated without relaunching the browser.
 
     Args:
-        tests_dir: Path to the tests directory (defaults to project tests/ folder)
+        scripts_dir: Directory of KaneAI scripts (defaults to kane-ai-generated/)
+        output_path: Suite file to write (defaults to kaneai-suites/kaneai_suite.robot, outside tests/ so a
+            plain ``robot tests/`` does not run the per-script tests twice); numbered _1, _2, ... when split
+        pattern: Glob pattern selecting scripts within scripts_dir
+        max_tests_per_suite: Split into several suites of at most this many tests (0 writes one suite)
+        page_path: HTML page whose element ids are used as locators (defaults to templates/index.html)
+        optimize: Remove redundant waits and checks from the generated keywords
+        drop_comments: Also drop step comments from the generated keywords
     """
-    if not tests_dir:
-        tests_dir = os.path.join(PROJECT_ROOT, "tests")
-    elif not os.path.isabs(tests_dir):
-        tests_dir = os.path.join(PROJECT_ROOT, tests_dir)
+    scripts_dir = _resolve_dir(scripts_dir, "kane-ai-generated")
+    output_path = _resolve_dir(output_path, os.path.join("kaneai-suites", "kaneai_suite.robot"))
 
-    if not os.path.isdir(tests_dir):
-        return json.dumps({"error": f"Directory not found: {tests_dir}"})
+    if not os.path.isdir(scripts_dir):
+        return json.dumps({"error": f"Directory not found: {scripts_dir}"})
 
-    results = []
-    for file in sorted(Path(tests_dir).glob("*.robot")):
-        content = file.read_text()
-        test_cases = []
-        in_test_cases = False
-        for line in content.split("\n"):
-            if line.strip().startswith("*** Test Cases ***"):
-                in_test_cases = True
-                continue
-            if line.strip().startswith("***"):
-                in_test_cases = False
-                continue
-            if in_test_cases and line and not line[0].isspace() and line.strip():
-                test_cases.append(line.strip())
-
-        results.append(
+    locators = _page_locators(page_path)
+    test_cases, failed, used = [], [], set()
+    for script in sorted(Path(scripts_dir).glob(pattern)):
+        try:
+            name = _unique_name(_derive_test_name(str(script)), used)
+            text, parsed, emitted = _suite_test_case(str(script), name, locators, optimize, drop_comments)
+        except Exception as e:  # report per-file failures instead of aborting the suite
+            failed.append({"input_file": str(script), "error": f"{type(e).__name__}: {e}"})
+            continue
+        test_cases.append(
             {
-                "file": str(file),
-                "filename": file.name,
-                "test_cases": test_cases,
-                "test_count": len(test_cases),
+                "input_file": str(script),
+                "test_name": name,
+                "total_steps_parsed": parsed,
+                "total_steps_emitted": emitted,
+                "text": text,
             }
         )
 
+    if not test_cases:
+        return json.dumps({"error": f"No scripts matching {pattern} could be migrated in {scripts_dir}", "failed": failed})
+
+    size = max_tests_per_suite if max_tests_per_suite > 0 else len(test_cases)
+    chunks = [test_cases[i:i + size] for i in range(0, len(test_cases), size)]
+    stem, ext = os.path.splitext(output_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # The suites may live outside tests/, so point them at its resources relative to where they are written.
+    resources = os.path.join(PROJECT_ROOT, "tests", "resources.robot")
+    header = SUITE_HEADER.format(resource=Path(os.path.relpath(resources, os.path.dirname(output_path))).as_posix())
+
+    suites = []
+    for n, chunk in enumerate(chunks, 1):
+        path = output_path if len(chunks) == 1 else f"{stem}_{n}{ext or '.robot'}"
+        with open(path, "w") as f:
+            f.write(header + "\n" + "\n\n".join(tc["text"] for tc in chunk) + "\n")
+        suites.append({"output_file": path, "tests": [{k: v for k, v in tc.items() if k != "text"} for tc in chunk]})
+
     return json.dumps(
         {
-            "tests_dir": tests_dir,
-            "total_files": len(results),
-            "total_tests": sum(r["test_count"] for r in results),
-            "files": results,
+            "status": "success",
+            "scripts_dir": scripts_dir,
+            "total_tests": len(test_cases),
+            "browser_sessions": len(suites),
+            "suites": suites,
+            "failed": failed,
         },
         indent=2,
     )
 
 
-@mcp.tool()
-def list_kaneai_scripts(scripts_dir: str = "") -> str:
+@_async_tool(_light_lane)
+def list_robot_tests(tests_dir: str = "", name_contains: str = "", limit: int = 0, offset: int = 0) -> str:
+    """List all existing Robot Framework test files and their test cases.
+
+    Args:
+        tests_dir: Path to the tests directory (defaults to project tests/ folder)
+        name_contains: Only include test cases whose name contains this text (case-insensitive)
+        limit: Maximum number of files to return (0 returns all)
+        offset: Number of matching files to skip
+    """
+    tests_dir = _resolve_dir(tests_dir, "tests")
+
+    if not os.path.isdir(tests_dir):
+        return json.dumps({"error": f"Directory not found: {tests_dir}"})
+
+    results = _robot_index.refresh(tests_dir)
+
+    if name_contains:
+        needle = name_contains.lower()
+        filtered = []
+        for r in results:
+            test_cases = [t for t in r["test_cases"] if needle in t.lower()]
+            if test_cases:
+                filtered.append({**r, "test_cases": test_cases, "test_count": len(test_cases)})
+        results = filtered
+
+    response = {
+        "tests_dir": tests_dir,
+        "total_files": len(results),
+        "total_tests": sum(r["test_count"] for r in results),
+    }
+    if limit or offset:
+        response["offset"] = offset
+        response["limit"] = limit
+        results = results[offset:offset + limit] if limit else results[offset:]
+    response["files"] = results
+
+    return json.dumps(response, indent=2)
+
+
+@_async_tool(_light_lane)
+def list_kaneai_scripts(
+    scripts_dir: str = "",
+    summary: bool = False,
+    fields: str = "",
+    limit: int = 0,
+    offset: int = 0,
+    compact: bool = False,
+) -> str:
     """List all KaneAI-generated Python scripts available for migration.
 
     Args:
         scripts_dir: Path to the KaneAI scripts directory (defaults to kane-ai-generated/)
+        summary: Return only step counts per script, without step summaries
+        fields: Comma-separated step fields for step summaries; default step, description, type
+        limit: Maximum number of scripts to return (0 returns all)
+        offset: Number of scripts to skip
+        compact: Emit JSON without indentation or extra whitespace
     """
-    if not scripts_dir:
-        scripts_dir = os.path.join(PROJECT_ROOT, "kane-ai-generated")
-    elif not os.path.isabs(scripts_dir):
-        scripts_dir = os.path.join(PROJECT_ROOT, scripts_dir)
+    scripts_dir = _resolve_dir(scripts_dir, "kane-ai-generated")
 
     if not os.path.isdir(scripts_dir):
         return json.dumps({"error": f"Directory not found: {scripts_dir}"})
 
+    try:
+        selected = _parse_fields(fields) or ("step", "description", "type")
+    except ValueError as e:
+        return json.dumps({"error": str(e)})
+
+    files = sorted(Path(scripts_dir).glob("*.py"))
+    response = {"scripts_dir": scripts_dir, "total_scripts": len(files)}
+    if limit or offset:
+        response["offset"] = offset
+        response["limit"] = limit
+        files = files[offset:offset + limit] if limit else files[offset:]
+
     results = []
-    for file in sorted(Path(scripts_dir).glob("*.py")):
-        content = file.read_text()
-        steps = _extract_steps(content)
-        results.append(
-            {
-                "file": str(file),
-                "filename": file.name,
-                "total_steps": len(steps),
-                "step_summary": [
-                    {"step": s["step"], "description": s["description"], "type": s["type"]}
-                    for s in steps
-                ],
-            }
-        )
+    for file in files:
+        steps = _load_steps(str(file))
+        entry = {
+            "file": str(file),
+            "filename": file.name,
+            "total_steps": len(steps),
+        }
+        if not summary:
+            entry["step_summary"] = _page_steps(steps, selected)
+        results.append(entry)
+    response["scripts"] = results
 
+    return _dumps(response, compact)
+
+
+@mcp.tool()
+async def tool_stats() -> str:
+    """Report per-tool call counts and timings, plus parse cache and Robot index hit counts."""
+    with _tool_timings_lock:
+        tools = {
+            name: {
+                **t,
+                "total_ms": round(t["total_ms"], 1),
+                "max_ms": round(t["max_ms"], 1),
+                "queued_ms": round(t["queued_ms"], 1),
+                "mean_ms": round(t["total_ms"] / t["calls"], 1) if t["calls"] else 0.0,
+            }
+            for name, t in sorted(_tool_timings.items())
+        }
     return json.dumps(
         {
-            "scripts_dir": scripts_dir,
-            "total_scripts": len(results),
-            "scripts": results,
+            "lanes": {lane.name: lane.workers for lane in (_heavy_lane, _light_lane)},
+            "tools": tools,
+            "parse_cache": dict(_parse_cache.stats),
+            "robot_index": dict(_robot_index.stats),
         },
         indent=2,
     )
@@ -0,0 +1,48 @@
+"""Button description → locator mapping against templates/index.html (run with pytest)."""
+
+import pytest
+
+from locator_index import LocatorIndex
+from server import _map_button_to_locator
+
+
+@pytest.mark.parametrize(
+    "description, locator",
+    [
+        # Resolved through the synonym keys registered in the index.
+        ("Click - button", "id:decrement-btn"),
+        ("Click Show/Hide button", "id:toggle-btn"),
+        ("Click Hide content button", "id:toggle-btn"),
+        # Resolved by the page's own ids and text.
+        ("Click Login button", "id:login-btn"),
+        ("Click Greet Me button", "id:greet-btn"),
+        ("Click Load Delayed Content button", "id:delayed-btn"),
+        # Buttons without an id are located by their exact text.
+        ("Click Cancel button in modal", "xpath://button[normalize-space()='Cancel']"),
+        ("Click Delete button", "xpath://button[normalize-space()='Delete']"),
+        ("Click Tab 2", "xpath://button[normalize-space()='Tab 2']"),
+        ("Click Dismiss Warning button", "xpath://button[normalize-space()='Dismiss Warning']"),
+    ],
+)
+def test_button_description_maps_to_locator(description, locator):
+    assert _map_button_to_locator(description) == locator
+
+
+@pytest.mark.parametrize(
+    "description",
+    [
+        # Synonyms must only match whole words, not inside other words or other buttons' names.
+        "Click Sign-up button",
+        "Click Download report button",
+        "Click Show Toast button",
+        "Click the minus button",
+    ],
+)
+def test_partial_words_do_not_match(description):
+    assert _map_button_to_locator(description) == f"xpath://button[contains(text(), '{description}')]"
+
+
+def test_synonyms_only_target_buttons_on_the_page():
+    page = LocatorIndex('<button id="save-btn">Save</button>')
+    assert _map_button_to_locator("Click Save button", page) == "id:save-btn"
+    assert _map_button_to_locator("Click - button", page) == "xpath://button[contains(text(), 'Click - button')]"
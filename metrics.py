@@ -0,0 +1,170 @@
+"""
+Per-route request metrics exposed in the Prometheus text format.
+
+Each worker process counts requests and records latency histograms in memory.
+When ``METRICS_DIR`` is set (as it should be under gunicorn), a background
+thread in every worker snapshots its counters to
+``<METRICS_DIR>/metrics-<pid>-<token>.json`` once per flush interval whenever
+they changed. Workers must import the app after forking (gunicorn's default,
+i.e. without ``--preload``). ``/metrics`` then sums the snapshots of all workers,
+so any worker can answer for the whole server. Point ``METRICS_DIR`` at an
+empty directory (ideally tmpfs) that is cleared when the server starts.
+"""
+
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+from flask import g, request
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_MIMETYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+
+def _format_le(bound: float) -> str:
+    return repr(float(bound))
+
+
+class RequestMetrics:
+    """Request counters and latency histograms, optionally shared through a directory."""
+
+    def __init__(self, directory: str | None = None, buckets=DEFAULT_BUCKETS, flush_interval: float = 1.0):
+        self.directory = directory
+        self.buckets = tuple(buckets)
+        self.flush_interval = flush_interval
+        # (route, method, status) -> count
+        self.requests: dict[tuple[str, str, str], int] = {}
+        # route -> [per-bucket counts..., +Inf count, sum of seconds]
+        self.latency: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._path = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._path = os.path.join(directory, f"metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+            atexit.register(self.flush)
+            threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True).start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def observe(self, route: str, method: str, status: int, seconds: float) -> None:
+        key = (route, method, str(status))
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.get(route)
+            if histogram is None:
+                histogram = self.latency[route] = [0] * (len(self.buckets) + 1) + [0.0]
+            histogram[index] += 1
+            histogram[-1] += seconds
+            self._dirty = True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "buckets": list(self.buckets),
+                "requests": [[*key, count] for key, count in self.requests.items()],
+                "latency": {route: list(values) for route, values in self.latency.items()},
+            }
+
+    def flush(self) -> None:
+        """Atomically write this process's counters to the shared directory."""
+        if self._path is None:
+            return
+        self._dirty = False
+        snapshot = self.snapshot()
+        tmp_path = f"{self._path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            # Metrics are best effort; never let a missing directory break a worker.
+            self._dirty = True
+
+    def collect(self) -> dict:
+        """Return counters summed over every process sharing the directory."""
+        snapshots = [self.snapshot()]
+        if self.directory:
+            for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+                if path == self._path:
+                    continue  # our in-memory snapshot is fresher
+                try:
+                    with open(path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+
+        requests: dict[tuple[str, str, str], int] = {}
+        latency: dict[str, list[float]] = {}
+        for snap in snapshots:
+            if tuple(snap["buckets"]) != self.buckets:
+                continue
+            for route, method, status, count in snap["requests"]:
+                key = (route, method, status)
+                requests[key] = requests.get(key, 0) + count
+            for route, values in snap["latency"].items():
+                merged = latency.setdefault(route, [0] * len(values))
+                for i, value in enumerate(values):
+                    merged[i] += value
+        return {"requests": requests, "latency": latency}
+
+    def render(self) -> str:
+        """Render the aggregated metrics in the Prometheus text exposition format."""
+        data = self.collect()
+        lines = [
+            "# HELP http_requests_total Total HTTP requests by route, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (route, method, status), count in sorted(data["requests"].items()):
+            lines.append(f"http_requests_total{{{_labels(route=route, method=method, status=status)}}} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for route, values in sorted(data["latency"].items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(
+                    f"http_request_duration_seconds_bucket{{{_labels(route=route, le=_format_le(bound))}}} {cumulative}"
+                )
+            cumulative += values[len(self.buckets)]
+            lines.append(f'http_request_duration_seconds_bucket{{{_labels(route=route, le="+Inf")}}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{_labels(route=route)}}} {values[-1]}")
+            lines.append(f"http_request_duration_seconds_count{{{_labels(route=route)}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def init_app(self, app) -> None:
+        """Time every request handled by ``app``."""
+
+        @app.before_request
+        def _start_timer():
+            g._metrics_start = time.perf_counter()
+
+        @app.after_request
+        def _record(response):
+            start = g.pop("_metrics_start", None)
+            if start is not None:
+                self.observe(
+                    request.endpoint or "unmatched",
+                    request.method,
+                    response.status_code,
+                    time.perf_counter() - start,
+                )
+            return response
@@ -0,0 +1,62 @@
+"""
+Responses whose body is fixed for the lifetime of a worker.
+
+The body is encoded once into identity, gzip and (when the optional ``brotli``
+package is installed) brotli variants. Each request only picks a variant from
+``Accept-Encoding`` and answers ``If-None-Match`` against a precomputed ETag.
+"""
+
+import gzip
+import hashlib
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Server preference when the client rates several encodings equally.
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+
+def compress_variants(data: bytes) -> dict[str, bytes]:
+    """Return the body encoded with every supported content-coding."""
+    variants = {"identity": data, "gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    # Drop encodings that do not actually save bytes (e.g. tiny bodies).
+    return {enc: body for enc, body in variants.items() if enc == "identity" or len(body) < len(data)}
+
+
+class PrecompressedBody:
+    """A fixed response body with precomputed content-codings and ETags."""
+
+    def __init__(self, data: bytes, mimetype: str, cache_control: str = "no-cache"):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.variants = compress_variants(data)
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        # Strong ETags must differ between encoded representations.
+        self.etags = {enc: digest if enc == "identity" else f"{digest}-{enc}" for enc in self.variants}
+
+    def select_encoding(self, accept_encodings) -> str:
+        """Pick the best available encoding for a werkzeug ``Accept`` header value."""
+        best, best_quality = "identity", 0.0
+        for enc in ENCODING_PREFERENCE:
+            if enc not in self.variants or enc == "identity":
+                continue
+            quality = accept_encodings[enc]
+            if quality > best_quality:
+                best, best_quality = enc, quality
+        return best
+
+    def make_response(self, request) -> Response:
+        encoding = self.select_encoding(request.accept_encodings)
+        response = Response(self.variants[encoding], mimetype=self.mimetype)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = self.cache_control
+        response.set_etag(self.etags[encoding])
+        return response.make_conditional(request)
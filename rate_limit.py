@@ -0,0 +1,104 @@
+"""
+Sharded in-memory token-bucket rate limiter.
+
+Buckets live in N independent shards, each with its own lock, so concurrent
+requests for different keys rarely contend. A bucket that has been idle long
+enough to refill completely is indistinguishable from a new one, so shards
+drop such buckets to keep memory bounded by the active key set. Each shard
+keeps its buckets in least-recently-updated order, so eviction only ever pops
+from the front and stays O(1) per call, even when a shard is full.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from zlib import crc32
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> [tokens, last_update], least recently updated first
+        self.buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+
+class TokenBucketLimiter:
+    """Allow ``capacity`` events in a burst, refilled at ``rate`` tokens per second, per key."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        shards: int = 16,
+        max_keys_per_shard: int = 10_000,
+        clock=time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys_per_shard = max_keys_per_shard
+        self.clock = clock
+        # Time for an empty bucket to refill; idle buckets older than this are full and can be dropped.
+        self.idle_ttl = capacity / rate
+        self._shards = [_Shard() for _ in range(shards)]
+
+    def _shard(self, key: str) -> _Shard:
+        # surrogatepass: keys come from JSON, which can carry lone surrogates.
+        return self._shards[crc32(key.encode("utf-8", "surrogatepass")) % len(self._shards)]
+
+    def _evict(self, shard: _Shard, now: float) -> None:
+        """Make room for one new bucket: drop full (idle) buckets, then the least recently used."""
+        buckets = shard.buckets
+        cutoff = now - self.idle_ttl
+        while buckets and next(iter(buckets.values()))[1] <= cutoff:
+            buckets.popitem(last=False)
+        # Hard cap, e.g. under a key spray: sacrifice the least recently used bucket.
+        while len(buckets) >= self.max_keys_per_shard:
+            buckets.popitem(last=False)
+
+    def _tokens(self, shard: _Shard, key: str, now: float) -> list[float]:
+        bucket = shard.buckets.get(key)
+        if bucket is None:
+            self._evict(shard, now)
+            bucket = shard.buckets[key] = [self.capacity, now]
+        else:
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            shard.buckets.move_to_end(key)
+        return bucket
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """Consume ``cost`` tokens. Return 0.0 on success, else seconds until they are available."""
+        shard = self._shard(key)
+        with shard.lock:
+            now = self.clock()
+            bucket = self._tokens(shard, key, now)
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / self.rate
+
+    def retry_after(self, key: str, cost: float = 1.0) -> float:
+        """Like :meth:`acquire` but without consuming tokens."""
+        shard = self._shard(key)
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                return 0.0
+            tokens = min(self.capacity, bucket[0] + (self.clock() - bucket[1]) * self.rate)
+            return 0.0 if tokens >= cost else (cost - tokens) / self.rate
+
+    def reset(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.buckets) for shard in self._shards)
+
+
+def retry_after_header(seconds: float) -> str:
+    """Format a wait time for the ``Retry-After`` header (whole seconds, at least 1)."""
+    return str(max(1, math.ceil(seconds)))
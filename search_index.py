@@ -0,0 +1,102 @@
+"""
+Substring search index for the /api/search catalog.
+
+Keys are lowercased once when the index is built. Every 1-, 2- and 3-gram of
+every key maps to a posting list of item positions, so a query only has to
+verify the items listed under its rarest n-gram instead of scanning the
+whole catalog on every request.
+"""
+
+import os
+from array import array
+from itertools import islice
+
+DEFAULT_ITEMS = ["Apple", "Banana", "Cherry", "Date", "Elderberry", "Fig", "Grape"]
+
+
+class Catalog:
+    """Interface for searchable catalogs used by /api/search."""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def iter_search(self, query: str):
+        """Yield every item whose key contains ``query`` (case-insensitive), in catalog order."""
+        raise NotImplementedError
+
+    def iter_page(self, query: str, limit: int | None = None, offset: int = 0):
+        """Lazily yield one page of matches for ``query``."""
+        stop = None if limit is None else offset + limit
+        return islice(self.iter_search(query), offset, stop)
+
+    def search(self, query: str, limit: int | None = None, offset: int = 0) -> list[str]:
+        """Return one page of matches for ``query``."""
+        return list(self.iter_page(query, limit, offset))
+
+
+class NGramIndex(Catalog):
+    """Catalog backed by an n-gram posting index over pre-lowercased keys."""
+
+    def __init__(self, items, max_gram: int = 3):
+        self.items = list(items)
+        self.keys = [item.lower() for item in self.items]
+        self.max_gram = max_gram
+        self.postings: dict[str, array] = {}
+
+        for pos, key in enumerate(self.keys):
+            seen = set()
+            for n in range(1, max_gram + 1):
+                for start in range(len(key) - n + 1):
+                    seen.add(key[start:start + n])
+            for gram in seen:
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array("I")
+                posting.append(pos)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _candidates(self, query: str) -> array | None:
+        """Return the shortest posting list covering ``query``, or ``None`` if it cannot match."""
+        n = min(len(query), self.max_gram)
+        best = None
+        for start in range(len(query) - n + 1):
+            posting = self.postings.get(query[start:start + n])
+            if posting is None:
+                return None
+            if best is None or len(posting) < len(best):
+                best = posting
+        return best
+
+    def iter_search(self, query: str):
+        if not query:
+            yield from self.items
+            return
+
+        query = query.lower()
+        candidates = self._candidates(query)
+        if candidates is None:
+            return
+
+        items = self.items
+        if len(query) <= self.max_gram:
+            # The posting list of the whole query is already exact.
+            for pos in candidates:
+                yield items[pos]
+            return
+
+        keys = self.keys
+        for pos in candidates:
+            if query in keys[pos]:
+                yield items[pos]
+
+
+def load_catalog(path: str | None = None) -> Catalog:
+    """Build the search index from a newline-delimited file, or the default fruit list."""
+    path = path or os.environ.get("CATALOG_PATH")
+    if not path:
+        return NGramIndex(DEFAULT_ITEMS)
+
+    with open(path, encoding="utf-8") as f:
+        return NGramIndex(line.strip() for line in f if line.strip())
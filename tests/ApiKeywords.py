@@ -0,0 +1,75 @@
+"""
+Robot Framework keywords that talk to the app's JSON API directly.
+
+Used for setup and teardown that does not need the browser: one pooled,
+keep-alive HTTP request instead of a dozen Selenium commands.
+The base URL defaults to the suite's ``${URL}`` variable.
+"""
+
+import json
+
+import urllib3
+from robot.api.deco import keyword, library
+from robot.libraries.BuiltIn import BuiltIn
+
+
+@library(scope="GLOBAL")
+class ApiKeywords:
+    def __init__(self, base_url: str = "", timeout: float = 5.0):
+        self._base_url = base_url.rstrip("/")
+        self._http = urllib3.PoolManager(
+            maxsize=4,
+            timeout=urllib3.Timeout(total=float(timeout)),
+            retries=False,
+            headers={"Content-Type": "application/json"},
+        )
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url or BuiltIn().get_variable_value("${URL}").rstrip("/")
+
+    def _post(self, path: str, payload: dict | None = None):
+        body = json.dumps(payload or {}).encode()
+        response = self._http.request("POST", self.base_url + path, body=body)
+        try:
+            data = json.loads(response.data) if response.data else {}
+        except ValueError:
+            data = {}
+        return response.status, data
+
+    @keyword("API Login")
+    def api_login(self, username: str, password: str, expected_status: int = 200) -> dict:
+        """Log in through ``/api/login`` and return the JSON response.
+
+        Fails unless the response status is ``expected_status`` (200 by default).
+        """
+        status, data = self._post("/api/login", {"username": username, "password": password})
+        if status != int(expected_status):
+            raise AssertionError(f"/api/login returned {status}, expected {expected_status}: {data}")
+        return data
+
+    @keyword("API Greet")
+    def api_greet(self, name: str) -> str:
+        """Return the greeting ``/api/greet`` produces for ``name``."""
+        status, data = self._post("/api/greet", {"name": name})
+        if status != 200:
+            raise AssertionError(f"/api/greet returned {status}: {data}")
+        return data["greeting"]
+
+    @keyword("Reset Server State")
+    def reset_server_state(self) -> None:
+        """Reset login throttles and caches through the test-only ``/api/reset`` endpoint.
+
+        The endpoint exists only when the app runs with ``ENABLE_TEST_ENDPOINTS=1``;
+        against any other server this fails right away instead of letting the test
+        run on unreset state. ``Reset Test State`` calls it only when the suite
+        sets ``${TEST_ENDPOINTS}``.
+        """
+        status, data = self._post("/api/reset")
+        if status == 404:
+            raise AssertionError(
+                f"{self.base_url}/api/reset is not enabled; start the app with ENABLE_TEST_ENDPOINTS=1 "
+                "or leave TEST_ENDPOINTS unset"
+            )
+        if status != 200:
+            raise AssertionError(f"/api/reset returned {status}: {data}")
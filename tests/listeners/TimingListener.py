@@ -0,0 +1,95 @@
+"""
+Robot Framework listener (API v3) recording the duration of every test and keyword.
+
+Nested keywords are recorded too, so the waits inside user keywords such as
+``Wait And Verify Text`` show up on their own with the resolved locator they
+waited on. Timings are written when the run ends, as compact JSON or as CSV
+depending on the file extension:
+
+    robot --listener tests/listeners/TimingListener.py:timings.json tests/
+    robot --listener tests/listeners/TimingListener.py:timings.csv tests/
+
+``{pid}`` in the path is replaced with the process id, which keeps the files of
+parallel ``robot`` processes apart. Summarize them with ``tools/timing_report.py``.
+"""
+
+import csv
+import json
+import os
+import re
+
+from robot.libraries.BuiltIn import BuiltIn
+
+FIELDS = ("kind", "suite", "test", "keyword", "parent", "depth", "leaf", "locator", "status", "seconds")
+
+_LOCATOR = re.compile(
+    r"^(?:id|name|xpath|css|link|partial link|class|tag|dom|jquery|identifier|text|element)[:=]|^//|^\(//",
+    re.IGNORECASE,
+)
+
+
+class TimingListener:
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, path: str = "timings.json"):
+        self.path = path.replace("{pid}", str(os.getpid()))
+        self.rows: list[tuple] = []
+        self._suites: list[str] = []
+        self._test = ""
+        self._stack: list[list] = []  # [name, locator, has_children]
+
+    @property
+    def _suite(self) -> str:
+        return self._suites[-1] if self._suites else ""
+
+    def start_suite(self, data, result):
+        self._suites.append(result.full_name)
+
+    def end_suite(self, data, result):
+        self._suites.pop()
+
+    def start_test(self, data, result):
+        self._test = result.full_name
+
+    def end_test(self, data, result):
+        self.rows.append(
+            ("test", self._suite, self._test, "", "", 0, False, "", result.status,
+             round(result.elapsed_time.total_seconds(), 4))
+        )
+        self._test = ""
+
+    def start_keyword(self, data, result):
+        if self._stack:
+            self._stack[-1][2] = True
+        self._stack.append([result.full_name, self._locator(data.args), False])
+
+    def end_keyword(self, data, result):
+        name, locator, has_children = self._stack.pop()
+        parent = self._stack[-1][0] if self._stack else ""
+        self.rows.append(
+            ("keyword", self._suite, self._test, name, parent, len(self._stack), not has_children, locator,
+             result.status, round(result.elapsed_time.total_seconds(), 4))
+        )
+
+    @staticmethod
+    def _locator(args) -> str:
+        if not args or not isinstance(args[0], str):
+            return ""
+        try:
+            first = str(BuiltIn().replace_variables(args[0]))
+        except Exception:  # unresolvable variable: keep the raw argument
+            first = args[0]
+        return first if _LOCATOR.match(first) else ""
+
+    def close(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.path.endswith(".csv"):
+            with open(self.path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(FIELDS)
+                writer.writerows(self.rows)
+        else:
+            with open(self.path, "w") as f:
+                json.dump({"fields": FIELDS, "rows": self.rows}, f, separators=(",", ":"))
@@ -0,0 +1,113 @@
+"""
+Timing comparison of the default and fast Robot resource modes.
+
+Runs ``tests/web_tests.robot`` (or the given suites) once per mode and
+repetition: with the default ``${DELAY}`` of ``resources.robot``, which
+``Set Selenium Speed`` applies to every command, and with ``DELAY:0s``, which
+relies on the explicit waits alone. Each run gets a fresh local gunicorn
+instance of the app.
+Prints per-test and total durations and the speedup, and optionally writes
+them as JSON.
+
+    python tools/compare_robot_modes.py --repeat 3 --output modes.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from robot.api import ExecutionResult
+
+from parallel_robot import PROJECT_ROOT, free_port, start_app
+
+MODES = {
+    "default": [],
+    "fast": ["--variable", "DELAY:0s"],
+}
+
+
+def run_mode(mode_args: list[str], paths: list[str], robot_args: list[str]) -> dict:
+    """Run the suites once with ``mode_args``; return status and durations in seconds."""
+    work_dir = tempfile.mkdtemp(prefix="robot-mode-")
+    port = free_port()
+    app = start_app(port, work_dir)
+    try:
+        cmd = [
+            sys.executable, "-m", "robot",
+            "--outputdir", work_dir,
+            "--log", "NONE",
+            "--report", "NONE",
+            "--console", "dotted",
+            "--variable", f"URL:http://127.0.0.1:{port}",
+            *mode_args,
+            *robot_args,
+            *paths,
+        ]
+        subprocess.run(cmd, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL)
+        result = ExecutionResult(os.path.join(work_dir, "output.xml"))
+    finally:
+        app.terminate()
+        app.wait(timeout=10)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    stats = result.suite.statistics
+    return {
+        "passed": stats.passed,
+        "failed": stats.failed,
+        "total": result.suite.elapsed_time.total_seconds(),
+        "tests": {t.full_name: t.elapsed_time.total_seconds() for t in result.suite.all_tests},
+    }
+
+
+def summarize(runs: list[dict]) -> dict:
+    """Median total and per-test durations over repeated runs of one mode."""
+    names = runs[0]["tests"]
+    return {
+        "passed": min(r["passed"] for r in runs),
+        "failed": max(r["failed"] for r in runs),
+        "total_s": round(statistics.median(r["total"] for r in runs), 3),
+        "tests": {n: round(statistics.median(r["tests"].get(n, 0.0) for r in runs), 3) for n in names},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Robot run times with and without Selenium speed")
+    parser.add_argument("paths", nargs="*", default=["tests/web_tests.robot"], help="Suites to run")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per mode; medians are reported")
+    parser.add_argument("--output", default="", help="Also write the comparison JSON here")
+    args, robot_args = parser.parse_known_args()
+    paths = [os.path.abspath(p) for p in args.paths]
+
+    results = {}
+    for mode, mode_args in MODES.items():
+        runs = []
+        for n in range(args.repeat):
+            print(f"{mode}: run {n + 1}/{args.repeat}", file=sys.stderr)
+            runs.append(run_mode(mode_args, paths, robot_args))
+        results[mode] = summarize(runs)
+
+    default, fast = results["default"], results["fast"]
+    print(f"{'test':<45} {'default s':>10} {'fast s':>8} {'speedup':>8}")
+    for name, seconds in default["tests"].items():
+        fast_seconds = fast["tests"].get(name, 0.0)
+        speedup = f"{seconds / fast_seconds:.1f}x" if fast_seconds else "-"
+        print(f"{name.rsplit('.', 1)[-1][:45]:<45} {seconds:>10.3f} {fast_seconds:>8.3f} {speedup:>8}")
+    speedup = default["total_s"] / fast["total_s"] if fast["total_s"] else 0.0
+    print(f"{'TOTAL':<45} {default['total_s']:>10.3f} {fast['total_s']:>8.3f} {speedup:>7.1f}x")
+    for mode, summary in results.items():
+        if summary["failed"]:
+            print(f"WARNING: {summary['failed']} test(s) failed in {mode} mode", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"repeat": args.repeat, "modes": results, "speedup": round(speedup, 2)}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
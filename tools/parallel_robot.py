@@ -0,0 +1,311 @@
+"""
+Sharded parallel runner for the Robot Framework suites.
+
+Collects every test case under the given paths (``tests/`` by default), splits
+them into N shards and runs each shard as its own ``robot`` process. Each shard
+opens its own headless browser through the suite's ``Open Test Browser`` setup
+and, unless ``--url`` is given, talks to its own gunicorn instance of
+``app:app`` on a free port with a private user database and the test-only
+``/api/reset`` endpoint enabled (and ``${TEST_ENDPOINTS}`` set to use it). The shard outputs are merged (as
+``rebot --merge`` would, but in suite order) into one ``output.xml``/
+``log.html``/``report.html`` in ``--outputdir``.
+
+Shards are balanced with the longest-processing-time rule on historical test
+durations stored in ``--durations`` (JSON, updated after every run). Tests with
+no history are assumed to take the median known duration. Within a shard,
+tests keep their order from the suite files, because later tests in
+``tests/web_tests.robot`` rely on the page state left by earlier ones.
+
+    python tools/parallel_robot.py --workers 4
+    python tools/parallel_robot.py --workers 2 --url https://your-app.up.railway.app
+    python tools/parallel_robot.py --plan            # show the shards and exit
+
+Unrecognized options (e.g. ``--variable BROWSER:firefox``) are passed to every
+``robot`` process.
+"""
+
+import argparse
+import heapq
+import http.client
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from robot import rebot
+from robot.api import ExecutionResult
+from robot.errors import DataError
+from robot.running import TestSuiteBuilder
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DURATIONS = os.path.join(PROJECT_ROOT, ".robot-durations.json")
+DEFAULT_DURATION = 1.0  # seconds assumed when there is no history at all
+SMOOTHING = 0.5  # weight of the latest run when updating historical durations
+
+
+def collect_tests(paths: list[str], include=(), exclude=()) -> list[str]:
+    """Return the full names of the test cases under ``paths`` in suite order, filtered by tag patterns."""
+    suite = TestSuiteBuilder().build(*paths)
+    if include or exclude:
+        suite.filter(included_tags=list(include) or None, excluded_tags=list(exclude) or None)
+    return [test.full_name for test in suite.all_tests]
+
+
+def tag_filters(robot_args: list[str]) -> tuple[list[str], list[str]]:
+    """Pull the ``--include``/``--exclude`` tag patterns out of pass-through robot options."""
+    filters = {"-i": [], "--include": [], "-e": [], "--exclude": []}
+    for option, value in zip(robot_args, robot_args[1:] + [""]):
+        option, sep, inline = option.partition("=")
+        if option in filters and (sep or value):
+            filters[option].append(inline if sep else value)
+    return filters["-i"] + filters["--include"], filters["-e"] + filters["--exclude"]
+
+
+def load_durations(path: str) -> dict[str, float]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def default_duration(tests: list[str], durations: dict[str, float]) -> float:
+    """Duration assumed for tests without history: the median of the known ones."""
+    known = [durations[t] for t in tests if t in durations]
+    return statistics.median(known) if known else DEFAULT_DURATION
+
+
+def plan_shards(tests: list[str], durations: dict[str, float], workers: int) -> list[list[str]]:
+    """Split ``tests`` into at most ``workers`` shards with balanced expected run time."""
+    default = default_duration(tests, durations)
+    order = {name: i for i, name in enumerate(tests)}
+
+    shards: list[list[str]] = [[] for _ in range(max(1, min(workers, len(tests))))]
+    heap = [(0.0, n) for n in range(len(shards))]
+    for name in sorted(tests, key=lambda t: (-durations.get(t, default), order[t])):
+        load, n = heapq.heappop(heap)
+        shards[n].append(name)
+        heapq.heappush(heap, (load + durations.get(name, default), n))
+    return [sorted(shard, key=order.__getitem__) for shard in shards]
+
+
+def _escape_pattern(name: str) -> str:
+    # --test takes glob patterns; make names containing *, ? or [ match literally.
+    return "".join(f"[{c}]" if c in "*?[" else c for c in name)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(
+    port: int, data_dir: str, workers: int = 1, threads: int = 4, env: dict[str, str] | None = None
+) -> subprocess.Popen:
+    """Start ``app:app`` under gunicorn on ``port`` and wait until it answers.
+
+    The app gets a private user database in ``data_dir`` and the test-only
+    endpoints; ``env`` adds or overrides environment variables. Also used by
+    ``benchmarks/http_bench.py``.
+    """
+    env = dict(os.environ, USER_DB_PATH=os.path.join(data_dir, "users.db"), ENABLE_TEST_ENDPOINTS="1", **(env or {}))
+    env.pop("METRICS_DIR", None)
+    cmd = [
+        sys.executable, "-m", "gunicorn", "app:app",
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(workers),
+        "--threads", str(threads),
+        "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=env)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            conn.close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not start within 30s")
+
+
+def run_shards(shards, paths, outputdir, url, robot_args) -> list[tuple[str, int]]:
+    """Run every shard concurrently; return each shard's output.xml path and robot return code."""
+    apps, procs, outputs = [], [], []
+    data_dir = tempfile.mkdtemp(prefix="robot-shards-")
+    try:
+        for n, shard in enumerate(shards, 1):
+            shard_dir = os.path.join(outputdir, f"shard-{n}")
+            os.makedirs(shard_dir, exist_ok=True)
+            shard_url, shard_args = url, []
+            if not shard_url:
+                port = free_port()
+                app_dir = os.path.join(data_dir, f"shard-{n}")
+                os.makedirs(app_dir)
+                apps.append(start_app(port, app_dir))
+                shard_url = f"http://127.0.0.1:{port}"
+                shard_args = ["--variable", "TEST_ENDPOINTS:True"]
+
+            cmd = [
+                sys.executable, "-m", "robot",
+                "--outputdir", shard_dir,
+                "--log", "NONE",
+                "--report", "NONE",
+                "--console", "dotted",
+                "--variable", f"URL:{shard_url}",
+            ]
+            for name in shard:
+                cmd += ["--test", _escape_pattern(name)]
+            cmd += shard_args + robot_args + paths
+            with open(os.path.join(shard_dir, "console.txt"), "w") as console:
+                procs.append(subprocess.Popen(cmd, cwd=PROJECT_ROOT, stdout=console, stderr=subprocess.STDOUT))
+            outputs.append(os.path.join(shard_dir, "output.xml"))
+            print(f"shard {n}: {len(shard)} tests against {shard_url}", file=sys.stderr)
+
+        for n, proc in enumerate(procs, 1):
+            proc.wait()
+            print(f"shard {n}: finished with status {proc.returncode}", file=sys.stderr)
+    finally:
+        # Also reached when a later shard fails to start: stop the robot runs already going.
+        for proc in procs + apps:
+            if proc.poll() is None:
+                proc.terminate()
+        for proc in procs + apps:
+            proc.wait(timeout=10)
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return [(path, proc.returncode) for path, proc in zip(outputs, procs)]
+
+
+def check_shards(results: list[tuple[str, int]]) -> tuple[list[str], list[str]]:
+    """Split shard results into usable output.xml files and errors for the shards that crashed.
+
+    robot returns the number of failed tests up to 250, and 252 or more for
+    bad options, interruption or an internal error; a negative code means the
+    process was killed. Either way, or without a readable output.xml, the
+    shard's tests are missing from the merged report.
+    """
+    outputs, errors = [], []
+    for n, (output, returncode) in enumerate(results, 1):
+        if returncode < 0 or returncode >= 252:
+            errors.append(f"shard {n}: robot exited with status {returncode}")
+            continue
+        try:
+            ExecutionResult(output)
+        except DataError as e:  # missing, or cut short by a crash
+            errors.append(f"shard {n}: {e}")
+            continue
+        outputs.append(output)
+    return outputs, errors
+
+
+def missing_tests(tests: list[str], output: str) -> list[str]:
+    """Return the names in ``tests`` that have no result in ``output``."""
+    ran = {test.full_name for test in ExecutionResult(output).suite.all_tests}
+    return [name for name in tests if name not in ran]
+
+
+_ADDED_MESSAGE = "*HTML* Test added from merged output."
+
+
+def _restore_order(suite, order: dict[str, int]) -> int:
+    """Sort tests and child suites back into suite-file order; return the suite's first index."""
+    first = {id(child): _restore_order(child, order) for child in suite.suites}
+    suite.suites.sort(key=lambda child: first[id(child)])
+    suite.tests.sort(key=lambda test: order.get(test.full_name, len(order)))
+    for test in suite.tests:
+        # Every shard's tests are "added" to the first shard's output; that is not news here.
+        if test.message == _ADDED_MESSAGE:
+            test.message = ""
+        elif test.message.startswith(_ADDED_MESSAGE + "<hr>"):
+            test.message = "*HTML* " + test.message[len(_ADDED_MESSAGE) + 4:]
+    indexes = [order.get(t.full_name, len(order)) for t in suite.tests] + list(first.values())
+    return min(indexes, default=len(order))
+
+
+def merge_outputs(outputs: list[str], outputdir: str, tests: list[str]) -> int:
+    """Merge shard outputs into one report in suite order; return the number of failed tests."""
+    result = ExecutionResult(*outputs, merge=True)
+    _restore_order(result.suite, {name: i for i, name in enumerate(tests)})
+    output = os.path.join(outputdir, "output.xml")
+    result.save(output)
+    return rebot(output, outputdir=outputdir, output="output.xml", stdout=sys.stderr)
+
+
+def update_durations(path: str, durations: dict[str, float], output: str) -> None:
+    result = ExecutionResult(output)
+    for test in result.suite.all_tests:
+        seconds = test.elapsed_time.total_seconds()
+        previous = durations.get(test.full_name)
+        durations[test.full_name] = round(
+            seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous, 3
+        )
+    with open(path, "w") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Robot Framework tests in parallel shards")
+    parser.add_argument("paths", nargs="*", default=["tests"], help="Suite files or directories (default: tests)")
+    # Each shard runs a browser and, without --url, a gunicorn app, so stay well below one per core.
+    parser.add_argument(
+        "--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Number of shards to run at once"
+    )
+    parser.add_argument("--outputdir", default="results", help="Directory for the merged report")
+    parser.add_argument("--durations", default=DEFAULT_DURATIONS, help="Historical test durations JSON")
+    parser.add_argument("--url", default="", help="Run every shard against this app instead of local instances")
+    parser.add_argument("--plan", action="store_true", help="Print the shard plan and exit")
+    args, robot_args = parser.parse_known_args()
+    paths = [os.path.abspath(p) for p in args.paths]
+    outputdir = os.path.abspath(args.outputdir)
+
+    tests = collect_tests(paths, *tag_filters(robot_args))
+    if not tests:
+        parser.error(f"no test cases found in {', '.join(args.paths)}")
+    durations = load_durations(args.durations)
+    shards = plan_shards(tests, durations, args.workers)
+
+    if args.plan:
+        default = default_duration(tests, durations)
+        for n, shard in enumerate(shards, 1):
+            expected = sum(durations.get(t, default) for t in shard)
+            print(f"shard {n} ({len(shard)} tests, ~{expected:.1f}s)")
+            for name in shard:
+                print(f"    {name}")
+        return
+
+    os.makedirs(outputdir, exist_ok=True)
+    started = time.perf_counter()
+    results = run_shards(shards, paths, outputdir, args.url, robot_args)
+    outputs, errors = check_shards(results)
+    for error in errors:
+        print(error, file=sys.stderr)
+    if not outputs:
+        print("No shard produced an output.xml", file=sys.stderr)
+        sys.exit(252)
+    status = merge_outputs(outputs, outputdir, tests)
+    output = os.path.join(outputdir, "output.xml")
+    update_durations(args.durations, durations, output)
+    print(f"{len(tests)} tests in {len(shards)} shards took {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    missing = missing_tests(tests, output)
+    if missing:
+        print(f"{len(missing)} tests have no result, e.g. {missing[0]}", file=sys.stderr)
+    if errors or missing:
+        sys.exit(status or 252)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1021 @@
+"""
+Change-based test selection for the Robot Framework suites.
+
+Indexes what every test case depends on — the element IDs, names and classes
+its locators resolve to in ``templates/index.html``, the page sections those
+elements live in, and the API routes it reaches through the page's scripts or
+``tests/ApiKeywords.py`` — and maps a git diff onto the same terms:
+
+* ``templates/index.html``: changed lines to page sections; script changes to
+  the sections whose elements call the changed functions or are touched by them
+* ``static/style.css``: changed rules to the sections their ``#id``/``.class``
+  selectors match
+* ``app.py`` and the local modules it imports, directly or through each
+  other: changed definitions to the routes that (transitively) use them
+* ``tests/``: changed test cases, and tests calling changed keywords
+
+Only the impacted tests run (through the shard runner in
+``tools/parallel_robot.py``); the last known result of every other test is
+reused from ``--cache``. Tests that have never run or did not pass last time
+always run again. Anything the index cannot place precisely — the page head,
+markup between sections, the app factory, a request hook, a tag-only CSS
+rule, a dependency pin — selects every test.
+
+    python tools/test_impact.py --dry-run            # show the selection and why
+    python tools/test_impact.py                      # run it, reuse cached results
+    python tools/test_impact.py --base main --workers 2
+    python tools/test_impact.py --index              # dump the per-test dependencies
+
+The diff is taken between ``--base`` (default: the commit of the last cached
+run) and the working tree, untracked files included. Unrecognized options are
+passed to ``robot``.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from html.parser import HTMLParser
+
+from robot.api import ExecutionResult
+from robot.running import ResourceFileBuilder, TestSuiteBuilder
+
+from parallel_robot import (
+    DEFAULT_DURATIONS,
+    PROJECT_ROOT,
+    check_shards,
+    load_durations,
+    merge_outputs,
+    plan_shards,
+    run_shards,
+    update_durations,
+)
+
+TEMPLATE = "templates/index.html"
+STYLESHEET = "static/style.css"
+APP_MODULE = "app.py"
+TESTS_DIR = "tests"
+DEFAULT_CACHE = os.path.join(PROJECT_ROOT, ".robot-impact-cache.json")
+
+# Changes here never reach the app under test or the suites.
+IGNORED_PREFIXES = (
+    "benchmarks/", "mcp-server/", "kane-ai-generated/", "tools/", ".github/", "tests/listeners/",
+    ".gitignore", ".mcp.json",
+)
+IGNORED_SUFFIXES = (".md", ".rst")
+# Dependency and runtime pins (anywhere in the tree): a version bump can break any test.
+DEPENDENCY_FILES = re.compile(r"(^|/)(requirements[\w.-]*\.txt|Procfile|runtime\.txt)$")
+# App methods whose registered callbacks run on every request.
+HOOK_METHODS = {
+    "init_app", "before_request", "after_request", "context_processor",
+    "teardown_request", "teardown_appcontext",
+}
+# Routes that deliver the page itself: a change there can break any test.
+PAGE_ROUTES = ("/", "/assets/<path:filename>")
+
+HEAD = "head"  # pseudo-section for <head>: the title, meta tags, stylesheet link
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+SECTION_TAGS = {"header", "footer"}
+
+_FUNCTION = re.compile(r"(?:async\s+)?function\s+([A-Za-z_$][\w$]*)")
+_DECLARED = re.compile(r"\b(?:let|const|var)\s+([A-Za-z_$][\w$]*)")
+_LISTENER = re.compile(r"getElementById\(\s*['\"]([\w-]+)['\"]\s*\)\s*\.addEventListener")
+_ELEMENT_ID = re.compile(r"getElementById\(\s*['\"]([\w-]+)['\"]|['\"`]#([\w-]+)")
+_FETCH = re.compile(r"fetch\(\s*[`'\"](/[^`'\"?$]*)")
+_CALL = re.compile(r"([A-Za-z_$][\w$]*)\s*\(")
+
+_STRATEGY = re.compile(
+    r"^(id|name|xpath|css|link|partial link|class|tag|dom|jquery|identifier|text|element)\s*[:=]\s*(.+)$",
+    re.IGNORECASE,
+)
+_XPATH_ATTR = re.compile(r"(?:contains\(\s*)?@(id|name|class)\s*(?:=|,)\s*['\"]([^'\"]+)['\"]")
+_CSS_ID = re.compile(r"#([\w-]+)")
+_CSS_CLASS = re.compile(r"\.([\w-]+)")
+_CSS_ATTR = re.compile(r"\[(id|name)\s*[~|^$*]?=\s*['\"]?([\w-]+)")
+_VARIABLE = re.compile(r"\$\{([^}]+)\}")
+_HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# SeleniumLibrary keywords whose first argument is a radio group name, not a locator.
+RADIO_GROUP_KEYWORDS = {"radiobuttonshouldbesetto", "radiobuttonshouldnotbeselected", "selectradiobutton"}
+
+
+def _normalize(name: str) -> str:
+    """Robot keyword name matching: case, space and underscore insensitive, library prefix dropped."""
+    return re.sub(r"[\s_]", "", name.rsplit(".", 1)[-1]).lower()
+
+
+# Line comment prefixes and (open, close) block comment delimiters per file suffix.
+_COMMENTS = {
+    ".py": (("#",), ()),
+    ".robot": (("#",), ()),
+    ".resource": (("#",), ()),
+    ".js": (("//",), (("/*", "*/"),)),
+    ".css": ((), (("/*", "*/"),)),
+    ".html": ((), (("<!--", "-->"),)),
+}
+
+
+def _ignorable(line: str, syntax: str) -> bool:
+    """Blank lines and whole-line comments in the comment syntax of ``syntax`` (a file suffix)."""
+    stripped = line.strip()
+    if not stripped:
+        return True
+    prefixes, blocks = _COMMENTS.get(syntax, ((), ()))
+    return stripped.startswith(prefixes) or any(
+        stripped.startswith(start) and stripped.endswith(end) for start, end in blocks
+    )
+
+
+def _read(path: str) -> str:
+    with open(os.path.join(PROJECT_ROOT, path), encoding="utf-8") as f:
+        return f.read()
+
+
+# ---------------------------------------------------------------------------
+# Page model
+# ---------------------------------------------------------------------------
+
+
+class _TemplateParser(HTMLParser):
+    """Collect elements with their section and line, plus the inline script."""
+
+    def __init__(self):
+        super().__init__()
+        self.elements: list[dict] = []
+        self.section_lines: dict[str, list[int]] = {}
+        self.script_start = 0
+        self.script_end = 0
+        self.script_text = ""
+        self._stack: list[int] = []
+        self._in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        line = self.getpos()[0]
+        attrs = {k: v or "" for k, v in attrs}
+        parent = self.elements[self._stack[-1]] if self._stack else None
+        element_id = attrs.get("id", "")
+        if tag == "head":
+            section = HEAD
+        elif tag in SECTION_TAGS:
+            section = tag
+        elif element_id and (tag == "section" or (parent and parent["tag"] == "body")):
+            section = element_id
+        else:
+            section = parent["section"] if parent else ""
+        self.elements.append({
+            "tag": tag,
+            "id": element_id,
+            "name": attrs.get("name", ""),
+            "classes": attrs.get("class", "").split(),
+            "handlers": sorted({m for k, v in attrs.items() if k.startswith("on") for m in _CALL.findall(v)}),
+            "section": section,
+            "parent": self._stack[-1] if self._stack else None,
+            "line": line,
+        })
+        if section:
+            lines = self.section_lines.setdefault(section, [line, line])
+            lines[1] = max(lines[1], line)
+        if tag == "script":
+            self._in_script = True
+            self.script_start = line
+        if tag not in VOID_TAGS:
+            self._stack.append(len(self.elements) - 1)
+
+    def handle_endtag(self, tag):
+        line = self.getpos()[0]
+        if tag == "script":
+            self._in_script = False
+            self.script_end = line
+        while self._stack:
+            element = self.elements[self._stack.pop()]
+            if element["section"]:
+                lines = self.section_lines[element["section"]]
+                lines[1] = max(lines[1], line)
+            if element["tag"] == tag:
+                break
+
+    def handle_data(self, data):
+        if self._in_script:
+            if not self.script_text:
+                self.script_start = self.getpos()[0]
+            self.script_text += data
+
+
+class PageModel:
+    """Elements of ``templates/index.html`` grouped into sections, and the script that drives them."""
+
+    def __init__(self, source: str):
+        parser = _TemplateParser()
+        parser.feed(source)
+        parser.close()
+        self.elements = parser.elements
+        self.section_lines = {s: tuple(lines) for s, lines in parser.section_lines.items()}
+        self.script_range = (parser.script_start, parser.script_end)
+        self.blocks = self._split_script(parser.script_text, parser.script_start)
+        self.lines = source.splitlines()
+
+        self.by_id = {e["id"]: i for i, e in enumerate(self.elements) if e["id"]}
+        self.function_blocks = {name: n for n, b in enumerate(self.blocks) for name in b["functions"]}
+        self.element_routes = [self._routes_of(i) for i in range(len(self.elements))]
+
+    @staticmethod
+    def _split_script(text: str, first_line: int) -> list[dict]:
+        """Split the inline script into its top-level statements (functions, listeners, variables)."""
+        lines = text.split("\n")
+        indents = [len(line) - len(line.lstrip()) for line in lines if line.strip()]
+        top = min(indents, default=0)
+        blocks: list[dict] = []
+        for offset, line in enumerate(lines):
+            stripped = line.strip()
+            starts_block = (
+                stripped
+                and len(line) - len(line.lstrip()) == top
+                and not stripped.startswith(("}", ")", "//"))
+            )
+            if starts_block or not blocks:
+                blocks.append({"start": first_line + offset, "text": ""})
+            blocks[-1]["end"] = first_line + offset
+            blocks[-1]["text"] += line + "\n"
+        for block in blocks:
+            text = block["text"]
+            block["functions"] = set(_FUNCTION.findall(text))
+            declared = _DECLARED.match(text.strip())  # top-level only; locals stay inside their function
+            block["names"] = block["functions"] | ({declared.group(1)} if declared else set())
+            block["listeners"] = set(_LISTENER.findall(text))
+            block["ids"] = {a or b for a, b in _ELEMENT_ID.findall(text)}
+            block["routes"] = set(_FETCH.findall(text))
+        return blocks
+
+    def _ancestors(self, index: int):
+        while index is not None:
+            yield index
+            index = self.elements[index]["parent"]
+
+    def _routes_of(self, index: int) -> set[str]:
+        """API routes an element can trigger: through its own handlers or a listener on it or an ancestor."""
+        routes = set()
+        for n in self._called_blocks(self.elements[index]["handlers"]):
+            routes |= self.blocks[n]["routes"]
+        ids = {self.elements[i]["id"] for i in self._ancestors(index)}
+        for block in self.blocks:
+            if block["listeners"] & ids:
+                routes |= block["routes"]
+        return routes
+
+    def _called_blocks(self, functions) -> set[int]:
+        """Blocks defining ``functions`` and, transitively, the functions they call."""
+        seen: set[int] = set()
+        pending = [self.function_blocks[f] for f in functions if f in self.function_blocks]
+        while pending:
+            n = pending.pop()
+            if n in seen:
+                continue
+            seen.add(n)
+            called = set(_CALL.findall(self.blocks[n]["text"]))
+            pending.extend(self.function_blocks[f] for f in called if f in self.function_blocks)
+        return seen
+
+    def section_at(self, line: int) -> str | None:
+        """Innermost section spanning ``line``, or None for markup outside every section."""
+        spans = [(last - first, s) for s, (first, last) in self.section_lines.items() if first <= line <= last]
+        return min(spans)[1] if spans else None
+
+    def block_at(self, line: int) -> int | None:
+        for n, block in enumerate(self.blocks):
+            if block["start"] <= line <= block["end"]:
+                return n
+        return None
+
+    def match(self, attr: str, value: str) -> list[int]:
+        if attr == "class":
+            return [i for i, e in enumerate(self.elements) if value in e["classes"]]
+        return [i for i, e in enumerate(self.elements) if e[attr] == value]
+
+    def script_impact(self, blocks: set[int]) -> tuple[set[str], set[str]]:
+        """Sections and element IDs affected by changes to the given script blocks.
+
+        A changed block affects the blocks that use the names it defines, the
+        elements whose handlers call into any of them, the elements they listen
+        on and the elements they look up by ID.
+        """
+        affected = set(blocks)
+        pending = list(blocks)
+        while pending:
+            names = self.blocks[pending.pop()]["names"]
+            for n, block in enumerate(self.blocks):
+                if n not in affected and names & set(re.findall(r"[A-Za-z_$][\w$]*", block["text"])):
+                    affected.add(n)
+                    pending.append(n)
+
+        functions = set().union(*(self.blocks[n]["functions"] for n in affected))
+        ids = set().union(*(self.blocks[n]["listeners"] | self.blocks[n]["ids"] for n in affected))
+        indexes = {i for i, e in enumerate(self.elements) if set(e["handlers"]) & functions}
+        indexes |= {self.by_id[i] for i in ids if i in self.by_id}
+        return {self.elements[i]["section"] for i in indexes} - {""}, ids
+
+    def mentioning(self, name: str) -> set[int]:
+        """Script blocks mentioning a class or ID, for the ones the script adds at runtime."""
+        pattern = re.compile(rf"(?<![\w-]){re.escape(name)}(?![\w])")
+        return {n for n, block in enumerate(self.blocks) if pattern.search(block["text"])}
+
+
+# ---------------------------------------------------------------------------
+# Stylesheet and app module
+# ---------------------------------------------------------------------------
+
+
+def parse_css_rules(source: str) -> list[tuple[str, int, int]]:
+    """Return ``(prelude, first_line, last_line)`` for every block, at-rules included."""
+    source = re.sub(r"/\*.*?\*/", lambda m: re.sub(r"[^\n]", " ", m.group()), source, flags=re.S)
+    rules, stack = [], []
+    line, prelude, prelude_line = 1, "", 1
+    for char in source:
+        if char == "{":
+            stack.append((prelude.strip(), prelude_line))
+            prelude = ""
+        elif char == "}":
+            if stack:
+                text, first = stack.pop()
+                rules.append((text, first, line))
+            prelude = ""
+        elif char == ";" and not stack:
+            prelude = ""
+        else:
+            if not prelude.strip() and not char.isspace():
+                prelude_line = line
+            prelude += char
+        if char == "\n":
+            line += 1
+    return rules
+
+
+class AppGraph:
+    """Top-level definitions of ``app.py``, what they reference and the routes they serve."""
+
+    GLOBAL = "<global>"
+
+    def __init__(self, source: str):
+        tree = ast.parse(source)
+        self.nodes: dict[str, dict] = {}
+        self.hooks: set[str] = set()  # nodes that run on every request
+        self.spans: list[tuple[int, int, str]] = []
+        self.imports: dict[str, set[str]] = defaultdict(set)  # module -> names bound in app.py
+
+        for stmt in tree.body:
+            first = min([stmt.lineno] + [d.lineno for d in getattr(stmt, "decorator_list", [])])
+            name = self._node_name(stmt)
+            if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+                for alias in stmt.names:
+                    module = stmt.module if isinstance(stmt, ast.ImportFrom) else alias.name
+                    self.imports[module.split(".")[0]].add((alias.asname or alias.name).split(".")[0])
+            self.spans.append((first, stmt.end_lineno, name))
+            if name in (None, self.GLOBAL):
+                continue
+            node = self.nodes.setdefault(name, {"refs": set(), "routes": set()})
+            node["refs"] |= self._references(stmt)
+            for decorator in getattr(stmt, "decorator_list", []):
+                if (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)
+                        and decorator.func.attr == "route" and decorator.args
+                        and isinstance(decorator.args[0], ast.Constant)):
+                    node["routes"].add(decorator.args[0].value)
+
+    def _node_name(self, stmt) -> str | None:
+        """Graph node a statement belongs to; GLOBAL when it affects the whole app, None when nothing."""
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            for decorator in stmt.decorator_list:
+                target = decorator.func if isinstance(decorator, ast.Call) else decorator
+                if isinstance(target, ast.Attribute) and target.attr in HOOK_METHODS:
+                    return self._hook(f"@{target.attr} {stmt.name}")
+                if isinstance(target, ast.Attribute) and target.attr != "route":
+                    return self.GLOBAL  # error handlers and other app-wide registrations
+            return stmt.name
+        if (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call)
+                and isinstance(stmt.value.func, ast.Attribute) and stmt.value.func.attr in HOOK_METHODS):
+            return self._hook(f"{ast.unparse(stmt.value.func)}() at line {stmt.lineno}")
+        if isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+            targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+            if len(targets) == 1:
+                key = self._config_key(targets[0])
+                if key:
+                    return key
+                if isinstance(targets[0], ast.Name):
+                    return targets[0].id
+            return self.GLOBAL
+        if isinstance(stmt, ast.If) and isinstance(stmt.test, ast.Compare) and "__name__" in ast.dump(stmt.test):
+            return None  # the development server entry point
+        if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            return None  # tracked through self.imports
+        return self.GLOBAL
+
+    def _hook(self, name: str) -> str:
+        self.hooks.add(name)
+        return name
+
+    @staticmethod
+    def _config_key(node) -> str | None:
+        if (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Attribute)
+                and node.value.attr == "config" and isinstance(node.slice, ast.Constant)):
+            return f"config:{node.slice.value}"
+        return None
+
+    def _references(self, stmt) -> set[str]:
+        refs = set()
+        for node in ast.walk(stmt):
+            if isinstance(node, ast.Name):
+                refs.add(node.id)
+            elif isinstance(node, ast.Subscript) and self._config_key(node):
+                refs.add(self._config_key(node))
+        return refs
+
+    def names_at(self, lines: set[int]) -> set[str]:
+        """Graph nodes (or GLOBAL) containing the changed lines."""
+        return {name for first, last, name in self.spans if name and any(first <= n <= last for n in lines)}
+
+    def reachable(self, names: set[str]) -> set[str]:
+        """``names`` and every node that references them, directly or transitively."""
+        affected, pending = set(names), list(names)
+        while pending:
+            name = pending.pop()
+            for other, node in self.nodes.items():
+                if other not in affected and name in node["refs"]:
+                    affected.add(other)
+                    pending.append(other)
+        return affected
+
+    def routes_using(self, names: set[str]) -> set[str]:
+        """Routes whose handlers reach any of ``names`` through the reference graph."""
+        routes = set()
+        for name in self.reachable(names):
+            routes |= self.nodes.get(name, {}).get("routes", set())
+        return routes
+
+
+def local_import_graph() -> dict[str, set[str]]:
+    """Top-level modules of the project and the other top-level modules each imports."""
+    modules = {name[:-3] for name in os.listdir(PROJECT_ROOT) if name.endswith(".py")}
+    graph = {}
+    for module in modules:
+        try:
+            tree = ast.parse(_read(f"{module}.py"))
+        except (SyntaxError, UnicodeDecodeError):
+            graph[module] = set()
+            continue
+        imported = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                imported.add(node.module.split(".")[0])
+            elif isinstance(node, ast.Import):
+                imported |= {alias.name.split(".")[0] for alias in node.names}
+        graph[module] = imported & modules - {module}
+    return graph
+
+
+def importers(graph: dict[str, set[str]], module: str) -> set[str]:
+    """``module`` and every local module that imports it, directly or transitively."""
+    found, pending = {module}, [module]
+    while pending:
+        target = pending.pop()
+        for other, imported in graph.items():
+            if other not in found and target in imported:
+                found.add(other)
+                pending.append(other)
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Test index
+# ---------------------------------------------------------------------------
+
+
+def _library_keywords(path: str) -> dict[str, dict]:
+    """Keywords of a Python library in tests/: normalized name -> routes and line span."""
+    tree = ast.parse(_read(path))
+    keywords = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.FunctionDef) or node.name.startswith("_"):
+            continue
+        name = node.name.replace("_", " ")
+        for decorator in node.decorator_list:
+            if (isinstance(decorator, ast.Call) and getattr(decorator.func, "id", "") == "keyword"
+                    and decorator.args and isinstance(decorator.args[0], ast.Constant)):
+                name = decorator.args[0].value
+        routes = {
+            n.value for n in ast.walk(node)
+            if isinstance(n, ast.Constant) and isinstance(n.value, str) and re.match(r"^/api/[\w/-]+$", n.value)
+        }
+        first = min([node.lineno] + [d.lineno for d in node.decorator_list])
+        keywords[_normalize(name)] = {"routes": routes, "lines": (first, node.end_lineno), "source": path}
+    return keywords
+
+
+class TestIndex:
+    """Per-test dependencies: sections, element IDs, routes, keywords and source lines."""
+
+    def __init__(self, page: PageModel, tests_dir: str = TESTS_DIR):
+        self.page = page
+        root = os.path.join(PROJECT_ROOT, tests_dir)
+        self.suite = TestSuiteBuilder().build(root)
+        self.keywords: dict[str, list] = defaultdict(list)
+        self.library_keywords: dict[str, dict] = {}
+        self.resources: dict[str, list] = {}  # resource path -> its keywords
+        suites = {os.path.normpath(test.source) for test in self.suite.all_tests}
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d != "listeners"]
+            for filename in sorted(filenames):
+                path = os.path.relpath(os.path.join(dirpath, filename), PROJECT_ROOT)
+                if filename.endswith(".py"):
+                    self.library_keywords.update(_library_keywords(path))
+                elif filename.endswith((".robot", ".resource")):
+                    if os.path.join(PROJECT_ROOT, path) in suites:
+                        continue
+                    resource = ResourceFileBuilder().build(os.path.join(PROJECT_ROOT, path))
+                    self.resources[path] = list(resource.keywords)
+                    for kw in resource.keywords:
+                        self.keywords[_normalize(kw.name)].append((path, kw))
+
+        self.tests: dict[str, dict] = {}
+        for test in self.suite.all_tests:
+            deps = {
+                "source": os.path.relpath(test.source, PROJECT_ROOT),
+                "line": test.lineno,
+                "sections": set(),
+                "ids": set(),
+                "routes": set(),
+                "keywords": set(),
+            }
+            local = {_normalize(kw.name): [(deps["source"], kw)] for kw in test.parent.resource.keywords}
+            items = [test.setup, *test.body, test.teardown]
+            suite = test.parent
+            while suite is not None:  # suite setups also run for this test
+                items = [suite.setup, *items, suite.teardown]
+                suite = suite.parent
+            self._collect(items, {}, deps, local, 0)
+            self.tests[test.full_name] = deps
+
+    def _collect(self, body, variables: dict, deps: dict, local: dict, depth: int) -> None:
+        for item in body:
+            if not item:
+                continue
+            if getattr(item, "type", "") in ("KEYWORD", "SETUP", "TEARDOWN") and item.name:
+                args = [self._substitute(str(a), variables) for a in item.args]
+                self._call(item.name, args, deps, local, depth)
+            for branch in getattr(item, "body", None) or ():
+                self._collect([branch], variables, deps, local, depth)
+
+    def _call(self, name: str, args: list[str], deps: dict, local: dict, depth: int) -> None:
+        key = _normalize(name)
+        if key == "titleshouldbe":
+            deps["sections"].add(HEAD)
+        if key in self.library_keywords:
+            deps["keywords"].add(key)
+            deps["routes"] |= self.library_keywords[key]["routes"]
+            return
+        definitions = local.get(key) or self.keywords.get(key, [])
+        if definitions and depth < 20:
+            deps["keywords"].add(key)
+            for _, kw in definitions:
+                self._collect(kw.body, self._bind(kw, args), deps, local, depth + 1)
+            return
+        for n, arg in enumerate(args):
+            if key in RADIO_GROUP_KEYWORDS and n == 0:
+                indexes = self.page.match("name", arg)
+            else:
+                indexes = self.resolve(arg)
+                if not indexes:
+                    self._resolve_generated(arg, deps)
+            for i in indexes:
+                element = self.page.elements[i]
+                deps["sections"].add(element["section"] or HEAD)
+                if element["id"]:
+                    deps["ids"].add(element["id"])
+                deps["routes"] |= self.page.element_routes[i]
+
+    def _resolve_generated(self, locator: str, deps: dict) -> None:
+        """Attribute an ID the script creates at runtime to the sections that script serves."""
+        match = _STRATEGY.match(locator)
+        if not match or match.group(1).lower() != "id":
+            return
+        element_id = match.group(2).strip()
+        blocks = self.page.mentioning(element_id)
+        if blocks:
+            sections, _ = self.page.script_impact(blocks)
+            deps["sections"] |= sections
+            deps["ids"].add(element_id)
+
+    @staticmethod
+    def _bind(kw, args: list[str]) -> dict:
+        """Argument values of a user keyword call, keyed by ``${name}``."""
+        spec = kw.args
+        values = {f"${{{name}}}": str(default) for name, default in spec.defaults.items()}
+        positional = list(spec.positional)
+        for n, arg in enumerate(args):
+            name, _, value = arg.partition("=")
+            if value and name in positional:
+                values[f"${{{name}}}"] = value
+            elif n < len(positional):
+                values[f"${{{positional[n]}}}"] = arg
+        return values
+
+    @staticmethod
+    def _substitute(arg: str, variables: dict) -> str:
+        return _VARIABLE.sub(lambda m: variables.get(m.group(), m.group()), arg)
+
+    def resolve(self, locator: str) -> list[int]:
+        """Elements a SeleniumLibrary locator can match in the page template."""
+        page = self.page
+        match = _STRATEGY.match(locator)
+        if match:
+            strategy, value = match.group(1).lower(), match.group(2).strip()
+        elif locator.startswith(("//", "(//")):
+            strategy, value = "xpath", locator
+        else:
+            strategy, value = "identifier", locator.strip()
+
+        if strategy == "id":
+            return page.match("id", value)
+        if strategy == "name":
+            return page.match("name", value)
+        if strategy == "identifier":
+            return page.match("id", value) + page.match("name", value)
+        if strategy == "class":
+            return page.match("class", value)
+        if strategy == "tag":
+            return page.match("tag", value.lower())
+        if strategy in ("css", "jquery"):
+            found = []
+            for element_id in _CSS_ID.findall(value):
+                found += page.match("id", element_id)
+            for attr, attr_value in _CSS_ATTR.findall(value):
+                found += page.match(attr, attr_value)
+            if not found:
+                for class_name in _CSS_CLASS.findall(value):
+                    found += page.match("class", class_name)
+            return found
+        if strategy == "xpath":
+            found = []
+            for attr, attr_value in _XPATH_ATTR.findall(value):
+                if attr == "class":
+                    for class_name in attr_value.split():
+                        found += page.match("class", class_name)
+                else:
+                    found += page.match(attr, attr_value)
+            return found
+        return []
+
+    def tests_in(self, source: str) -> list[str]:
+        return [name for name, deps in self.tests.items() if deps["source"] == source]
+
+    def as_json(self) -> dict:
+        return {
+            name: {k: sorted(v) if isinstance(v, set) else v for k, v in deps.items()}
+            for name, deps in self.tests.items()
+        }
+
+
+# ---------------------------------------------------------------------------
+# Diff to impact
+# ---------------------------------------------------------------------------
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=PROJECT_ROOT, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def changed_lines(base: str) -> dict[str, set[int]]:
+    """Changed line numbers (in the working tree) per file between ``base`` and the working tree.
+
+    A pure deletion is reported as the lines on both sides of where it was;
+    a deleted file maps to an empty set.
+    """
+    changes: dict[str, set[int]] = {}
+    path = None
+    for line in _git("diff", "-U0", "--no-color", "--no-ext-diff", base, "--").splitlines():
+        if line.startswith("--- "):
+            path = line[6:] if line.startswith("--- a/") else None
+        elif line.startswith("+++ "):
+            if line.startswith("+++ b/"):
+                path = line[6:]
+            if path:
+                changes.setdefault(path, set())
+        elif path and (match := _HUNK.match(line)):
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            changes[path] |= set(range(start, start + count)) if count else {start, start + 1}
+    for path in _git("ls-files", "--others", "--exclude-standard").splitlines():
+        try:
+            with open(os.path.join(PROJECT_ROOT, path), encoding="utf-8", errors="replace") as f:
+                changes[path] = set(range(1, len(f.read().splitlines()) + 2))
+        except OSError:
+            continue
+    return changes
+
+
+class Impact:
+    """What a diff touches, with a human-readable reason for each item."""
+
+    def __init__(self):
+        self.everything: list[str] = []
+        self.sections: dict[str, set[str]] = defaultdict(set)
+        self.routes: dict[str, set[str]] = defaultdict(set)
+        self.keywords: dict[str, set[str]] = defaultdict(set)
+        self.tests: dict[str, set[str]] = defaultdict(set)
+
+    def select(self, index: TestIndex) -> dict[str, list[str]]:
+        """Impacted tests with the reasons each was selected."""
+        selected: dict[str, list[str]] = {}
+        for name, deps in index.tests.items():
+            reasons = [f"{why} (all tests)" for why in self.everything]
+            for section in sorted(deps["sections"] & self.sections.keys()):
+                reasons += [f"section {section}: {why}" for why in sorted(self.sections[section])]
+            for route in sorted(deps["routes"] & self.routes.keys()):
+                reasons += [f"route {route}: {why}" for why in sorted(self.routes[route])]
+            for keyword in sorted(deps["keywords"] & self.keywords.keys()):
+                reasons += [f"keyword {why}" for why in sorted(self.keywords[keyword])]
+            reasons += sorted(self.tests.get(name, ()))
+            if reasons:
+                selected[name] = reasons
+        return selected
+
+
+def analyze(changes: dict[str, set[int]], page: PageModel, app: AppGraph, index: TestIndex) -> Impact:
+    impact = Impact()
+    graph = local_import_graph()
+
+    for path, lines in sorted(changes.items()):
+        exists = os.path.exists(os.path.join(PROJECT_ROOT, path))
+        if DEPENDENCY_FILES.search(path):
+            impact.everything.append(f"{path} changed dependencies")
+            continue
+        if path.startswith(IGNORED_PREFIXES) or path.endswith(IGNORED_SUFFIXES):
+            continue
+        if not exists:
+            if path.startswith(f"{TESTS_DIR}/") and path.endswith(".robot"):
+                continue  # a removed suite has no tests left to select
+            impact.everything.append(f"{path} was deleted")
+            continue
+        if path != STYLESHEET:  # CSS comments are stripped by the rule parser instead
+            with open(os.path.join(PROJECT_ROOT, path), encoding="utf-8", errors="replace") as f:
+                text = f.read().splitlines()
+            suffix = os.path.splitext(path)[1]
+            lines = {
+                n for n in lines
+                if n > len(text) or not _ignorable(text[n - 1], _syntax_at(path, suffix, n, page))
+            }
+        if not lines:
+            continue
+
+        if path == TEMPLATE:
+            _analyze_template(path, lines, page, impact)
+        elif path == STYLESHEET:
+            _analyze_stylesheet(path, lines, page, impact)
+        elif path == APP_MODULE:
+            _analyze_names(path, app.names_at(lines), app, impact)
+        elif "/" not in path and path.endswith(".py") and path[:-3] in graph:
+            # app.py sees a module's changes through the names it imports from it
+            # or from any local module that (transitively) imports it.
+            used = {m for m in importers(graph, path[:-3]) if m in app.imports}
+            names = set().union(*(app.imports[m] for m in used))
+            if names:
+                _analyze_names(path, names, app, impact, via=f"{path} via {', '.join(sorted(names))}")
+        elif path.startswith(f"{TESTS_DIR}/"):
+            _analyze_tests(path, lines, index, impact)
+        elif lines:
+            impact.everything.append(f"{path} changed")
+    return impact
+
+
+def _syntax_at(path: str, suffix: str, line: int, page: PageModel) -> str:
+    """Comment syntax of ``line``: the template's inline script is JavaScript."""
+    if path == TEMPLATE and page.script_range[0] < line < page.script_range[1]:
+        return ".js"
+    return suffix
+
+
+def _analyze_template(path, lines, page, impact):
+    script_first, script_last = page.script_range
+    blocks = set()
+    for line in sorted(lines):
+        if script_first < line < script_last:
+            block = page.block_at(line)
+            if block is not None:
+                blocks.add(block)
+            continue
+        section = page.section_at(line)
+        if section is None:
+            impact.everything.append(f"{path}:{line} is outside every section")
+        elif line <= len(page.lines):
+            impact.sections[section].add(f"{path}:{line}")
+    for n in sorted(blocks):
+        block = page.blocks[n]
+        where = f"{path}:{block['start']} script"
+        if not block["names"] and not block["listeners"]:
+            impact.everything.append(f"{where} runs at page load")
+            continue
+        sections, _ = page.script_impact({n})
+        for section in sections:
+            impact.sections[section].add(where)
+
+
+def _analyze_stylesheet(path, lines, page, impact):
+    rules = parse_css_rules(_read(path))
+    text = _read(path).splitlines()
+    for line in sorted(lines):
+        spans = [(last - first, prelude, first) for prelude, first, last in rules if first <= line <= last]
+        if not spans:
+            if line <= len(text) and not _ignorable(text[line - 1], ".css"):
+                impact.everything.append(f"{path}:{line} is outside every rule")
+            continue
+        _, prelude, first = min(spans)
+        where = f"{path}:{first} {prelude[:40]}"
+        if prelude.startswith("@"):
+            impact.everything.append(f"{where} at-rule")
+            continue
+        for selector in prelude.split(","):
+            ids, classes = _CSS_ID.findall(selector), _CSS_CLASS.findall(selector)
+            if not ids and not classes:
+                scopes = SECTION_TAGS.intersection(re.findall(r"(?<![\w.#:-])([a-z][\w-]*)", selector))
+                if not scopes:
+                    impact.everything.append(f"{where} matches by tag")
+                for section in scopes:
+                    impact.sections[section].add(where)
+                continue
+            indexes = [i for element_id in ids for i in page.match("id", element_id)]
+            if not ids:
+                # The rightmost class names the styled element; the others only scope it.
+                target = _CSS_CLASS.findall(selector.split()[-1]) or classes
+                indexes = [i for class_name in target for i in page.match("class", class_name)]
+                blocks = set().union(*(page.mentioning(c) for c in target))
+                if blocks:
+                    sections, _ = page.script_impact(blocks)
+                    for section in sections:
+                        impact.sections[section].add(where)
+            for i in indexes:
+                impact.sections[page.elements[i]["section"] or HEAD].add(where)
+
+
+def _analyze_names(path, names, app, impact, via=""):
+    if AppGraph.GLOBAL in names:
+        impact.everything.append(f"{path} changed module-level setup")
+        names = names - {AppGraph.GLOBAL}
+    why = via or f"{path} {', '.join(sorted(names))}"
+    for hook in sorted(app.reachable(names) & app.hooks):
+        cause = f"{path} changed" if hook in names else f"{why} reaches"
+        impact.everything.append(f"{cause} {hook}, which runs on every request")
+    for route in sorted(app.routes_using(names)):
+        if route in PAGE_ROUTES:
+            impact.everything.append(f"{why} serves the page")
+        else:
+            impact.routes[route].add(why)
+
+
+def _analyze_tests(path, lines, index, impact):
+    if path in index.resources:
+        keywords = index.resources[path]
+        for line in sorted(lines):
+            owner = [kw for kw in keywords if kw.lineno <= line]
+            if not owner:
+                impact.everything.append(f"{path}:{line} changed resource settings")
+                continue
+            kw = max(owner, key=lambda k: k.lineno)
+            impact.keywords[_normalize(kw.name)].add(f"{kw.name} in {path}:{kw.lineno}")
+        return
+    library = {k: v for k, v in index.library_keywords.items() if v["source"] == path}
+    if library:
+        for line in sorted(lines):
+            owner = [k for k, v in library.items() if v["lines"][0] <= line <= v["lines"][1]]
+            if not owner:
+                impact.everything.append(f"{path}:{line} changed library setup")
+            for key in owner:
+                impact.keywords[key].add(f"{key} in {path}:{library[key]['lines'][0]}")
+        return
+    tests = sorted((index.tests[name]["line"], name) for name in index.tests_in(path))
+    if not tests:
+        return
+    for line in sorted(lines):
+        if line < tests[0][0]:
+            for _, name in tests:
+                impact.tests[name].add(f"{path}:{line} changed suite settings")
+            continue
+        owner = max((t for t in tests if t[0] <= line), key=lambda t: t[0])[1]
+        impact.tests[owner].add(f"{path}:{line} changed the test")
+
+
+# ---------------------------------------------------------------------------
+# Cache and runner
+# ---------------------------------------------------------------------------
+
+
+def load_cache(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"base": "", "results": {}}
+
+
+def save_cache(path: str, cache: dict) -> None:
+    with open(path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def plan(base: str, cache: dict) -> tuple[TestIndex, dict[str, list[str]]]:
+    """Build the index and return it with the tests to run and why."""
+    page = PageModel(_read(TEMPLATE))
+    index = TestIndex(page)
+    selected: dict[str, list[str]] = {}
+    if base:
+        impact = analyze(changed_lines(base), page, AppGraph(_read(APP_MODULE)), index)
+        selected = impact.select(index)
+    results = cache.get("results", {})
+    for name in index.tests:
+        if not base:
+            selected.setdefault(name, []).append("no base revision to diff against (all tests)")
+        elif name not in results:
+            selected.setdefault(name, []).append("no cached result")
+        elif results[name]["status"] != "PASS":
+            selected.setdefault(name, []).append(f"cached status {results[name]['status']}")
+    order = list(index.tests)
+    return index, dict(sorted(selected.items(), key=lambda item: order.index(item[0])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run only the Robot tests impacted by a change")
+    parser.add_argument("--base", default="", help="Revision to diff against (default: last cached run)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="Cached results of earlier runs")
+    parser.add_argument("--workers", type=int, default=1, help="Number of shards to run at once")
+    parser.add_argument("--outputdir", default="results", help="Directory for the report of the selected tests")
+    parser.add_argument("--durations", default=DEFAULT_DURATIONS, help="Historical test durations JSON")
+    parser.add_argument("--url", default="", help="Run against this app instead of local instances")
+    parser.add_argument("--dry-run", action="store_true", help="Print the selection and the reasons, then exit")
+    parser.add_argument("--index", action="store_true", help="Print the per-test dependency index as JSON")
+    args, robot_args = parser.parse_known_args()
+
+    cache = load_cache(args.cache)
+    base = args.base or cache.get("base", "")
+    index, selected = plan(base, cache)
+    if args.index:
+        json.dump(index.as_json(), sys.stdout, indent=2)
+        print()
+        return
+
+    results = cache.setdefault("results", {})
+    reused = [name for name in index.tests if name not in selected]
+    print(f"{len(selected)} of {len(index.tests)} tests impacted since {base or 'the first run'}", file=sys.stderr)
+    for name, reasons in selected.items():
+        print(f"RUN    {name}")
+        for reason in reasons[:5]:
+            print(f"           {reason}")
+        if len(reasons) > 5:
+            print(f"           ... and {len(reasons) - 5} more")
+    for name in reused:
+        print(f"CACHED {name}: {results[name]['status']} at {results[name]['commit'][:10]}")
+    if args.dry_run:
+        return
+
+    head = _git("rev-parse", "HEAD").strip()
+    status = 0
+    if selected:
+        outputdir = os.path.abspath(args.outputdir)
+        os.makedirs(outputdir, exist_ok=True)
+        tests = list(selected)
+        durations = load_durations(args.durations)
+        started = time.perf_counter()
+        shard_results = run_shards(plan_shards(tests, durations, args.workers), [os.path.join(PROJECT_ROOT, TESTS_DIR)],
+                                   outputdir, args.url, robot_args)
+        outputs, errors = check_shards(shard_results)
+        for error in errors:
+            print(error, file=sys.stderr)
+        if not outputs:
+            print("No shard produced an output.xml; the cache was not updated", file=sys.stderr)
+            sys.exit(252)
+        status = merge_outputs(outputs, outputdir, tests)
+        output = os.path.join(outputdir, "output.xml")
+        update_durations(args.durations, durations, output)
+        ran = {test.full_name: test for test in ExecutionResult(output).suite.all_tests}
+        missing = set(tests) - ran.keys()
+        if errors or missing:
+            print(f"{len(missing)} selected tests did not run; the cache was not updated", file=sys.stderr)
+            sys.exit(status or 252)
+        for name, test in ran.items():
+            results[name] = {"status": test.status, "commit": head,
+                             "seconds": round(test.elapsed_time.total_seconds(), 3)}
+        print(f"{len(tests)} tests took {time.perf_counter() - started:.1f}s; "
+              f"reused {len(reused)} cached results", file=sys.stderr)
+
+    for name in set(results) - set(index.tests):
+        del results[name]  # removed or renamed tests
+    cache["base"] = head
+    save_cache(args.cache, cache)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
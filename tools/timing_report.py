@@ -0,0 +1,115 @@
+"""
+Slowest-keyword report for timings recorded by tests/listeners/TimingListener.py.
+
+Ranks the slowest keywords (by total time across all calls), the slowest
+locators (time spent in library keywords acting on each locator) and the
+slowest tests. With ``--previous`` it also compares against an earlier run
+and exits with status 1 if any test or keyword got slower by more than
+``--threshold`` percent and ``--min-delta`` seconds.
+
+    python tools/timing_report.py timings.json
+    python tools/timing_report.py shard-*.json --previous last-run.json --threshold 25
+"""
+
+import argparse
+import csv
+import json
+import sys
+from collections import defaultdict
+
+# Mirrors FIELDS in tests/listeners/TimingListener.py.
+FIELDS = ("kind", "suite", "test", "keyword", "parent", "depth", "leaf", "locator", "status", "seconds")
+
+
+def load_rows(paths: list[str]) -> list[dict]:
+    """Read listener output files (JSON or CSV) into one list of row dicts."""
+    rows = []
+    for path in paths:
+        if path.endswith(".csv"):
+            with open(path, newline="") as f:
+                for row in csv.DictReader(f):
+                    row["depth"] = int(row["depth"])
+                    row["leaf"] = row["leaf"] == "True"
+                    row["seconds"] = float(row["seconds"])
+                    rows.append(row)
+        else:
+            with open(path) as f:
+                data = json.load(f)
+            rows.extend(dict(zip(data["fields"], values)) for values in data["rows"])
+    return rows
+
+
+def aggregate(rows: list[dict], key, where=lambda row: True) -> dict[str, dict]:
+    """Group rows by ``key(row)`` into call count, total, mean and max seconds."""
+    groups = defaultdict(list)
+    for row in rows:
+        if where(row):
+            k = key(row)
+            if k:
+                groups[k].append(row["seconds"])
+    return {
+        k: {"calls": len(v), "total": sum(v), "mean": sum(v) / len(v), "max": max(v)}
+        for k, v in groups.items()
+    }
+
+
+def summarize(rows: list[dict]) -> dict[str, dict[str, dict]]:
+    return {
+        "tests": aggregate(rows, lambda r: r["test"], lambda r: r["kind"] == "test"),
+        "keywords": aggregate(rows, lambda r: r["keyword"], lambda r: r["kind"] == "keyword"),
+        # Leaves only, so a user keyword and the library keywords inside it are not counted twice.
+        "locators": aggregate(rows, lambda r: r["locator"], lambda r: r["kind"] == "keyword" and r["leaf"]),
+    }
+
+
+def print_ranking(title: str, stats: dict[str, dict], top: int) -> None:
+    print(f"\n{title}")
+    print(f"{'total s':>9} {'calls':>6} {'mean s':>8} {'max s':>8}  name")
+    ranked = sorted(stats.items(), key=lambda item: item[1]["total"], reverse=True)[:top]
+    for name, s in ranked:
+        print(f"{s['total']:>9.3f} {s['calls']:>6} {s['mean']:>8.3f} {s['max']:>8.3f}  {name}")
+
+
+def diff(current: dict, previous: dict, threshold: float, min_delta: float) -> list[str]:
+    """Return human-readable slowdowns of mean durations in ``current`` against ``previous``."""
+    regressions = []
+    for section in ("tests", "keywords", "locators"):
+        for name, cur in current[section].items():
+            prev = previous[section].get(name)
+            if prev is None:
+                continue
+            delta = cur["mean"] - prev["mean"]
+            if delta >= min_delta and cur["mean"] > prev["mean"] * (1 + threshold / 100):
+                regressions.append(
+                    f"{section[:-1]} {name}: mean {cur['mean']:.3f}s vs {prev['mean']:.3f}s (+{delta:.3f}s)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank the slowest Robot keywords, locators and tests")
+    parser.add_argument("timings", nargs="+", help="Listener output files (JSON or CSV) of the current run")
+    parser.add_argument("--previous", nargs="*", default=[], help="Listener output files of an earlier run")
+    parser.add_argument("--top", type=int, default=15, help="Entries per ranking")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed slowdown in percent")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="Ignore slowdowns below this many seconds")
+    args = parser.parse_args()
+
+    current = summarize(load_rows(args.timings))
+    print_ranking("Slowest tests", current["tests"], args.top)
+    print_ranking("Slowest keywords", current["keywords"], args.top)
+    print_ranking("Slowest locators", current["locators"], args.top)
+
+    if args.previous:
+        regressions = diff(current, summarize(load_rows(args.previous)), args.threshold, args.min_delta)
+        print()
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No slowdowns beyond {args.threshold}% and {args.min_delta}s against the previous run",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
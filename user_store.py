@@ -0,0 +1,149 @@
+"""
+User storage and password verification for /api/login.
+
+Passwords are stored as salted PBKDF2-SHA256 hashes with a tunable iteration
+count. Hashing runs on the request thread, but at most ``workers`` hashes run
+at once (hashlib releases the GIL, so they do run in parallel), so a burst of
+logins cannot occupy every core. Credentials that verified recently are
+remembered in a short-lived cache so repeated logins skip both the hash and the
+database lookup.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import sqlite3
+import threading
+
+from response_cache import LRUCache
+
+DEFAULT_ITERATIONS = 200_000
+HASH_ALGORITHM = "pbkdf2_sha256"
+
+
+def _encode(text: str) -> bytes:
+    # surrogatepass: JSON strings can carry lone surrogates, which strict UTF-8 rejects.
+    return text.encode("utf-8", "surrogatepass")
+
+
+def hash_password(password: str, iterations: int = DEFAULT_ITERATIONS, salt: bytes | None = None) -> str:
+    """Return an encoded ``pbkdf2_sha256$<iterations>$<salt>$<hash>`` string."""
+    salt = salt or os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", _encode(password), salt, iterations)
+    return "$".join(
+        [
+            HASH_ALGORITHM,
+            str(iterations),
+            base64.b64encode(salt).decode(),
+            base64.b64encode(digest).decode(),
+        ]
+    )
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Check ``password`` against a hash produced by :func:`hash_password`."""
+    try:
+        algorithm, iterations, salt, expected = encoded.split("$")
+    except ValueError:
+        return False
+    if algorithm != HASH_ALGORITHM:
+        return False
+    digest = hashlib.pbkdf2_hmac("sha256", _encode(password), base64.b64decode(salt), int(iterations))
+    return hmac.compare_digest(digest, base64.b64decode(expected))
+
+
+class UserStore:
+    """Interface for looking up and storing password hashes."""
+
+    def get_password_hash(self, username: str) -> str | None:
+        raise NotImplementedError
+
+    def set_password_hash(self, username: str, password_hash: str) -> None:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+
+class SQLiteUserStore(UserStore):
+    """User table in a SQLite database, with one reused connection per thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "username TEXT PRIMARY KEY, password_hash TEXT NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path)
+        return conn
+
+    def get_password_hash(self, username: str) -> str | None:
+        row = self._connection().execute(
+            "SELECT password_hash FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_password_hash(self, username: str, password_hash: str) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO users (username, password_hash) VALUES (?, ?) "
+                "ON CONFLICT(username) DO UPDATE SET password_hash = excluded.password_hash",
+                (username, password_hash),
+            )
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+
+class Authenticator:
+    """Verify credentials against a :class:`UserStore` with a verified-credential cache."""
+
+    def __init__(
+        self,
+        store: UserStore,
+        iterations: int = DEFAULT_ITERATIONS,
+        workers: int = 4,
+        cache_size: int = 1024,
+        cache_ttl: float = 30.0,
+    ):
+        self.store = store
+        self.iterations = iterations
+        # Caps concurrent PBKDF2 runs; callers wait for a slot instead of handing off to another thread.
+        self._hash_slots = threading.BoundedSemaphore(workers)
+        self.cache = LRUCache(cache_size, cache_ttl)
+        # Cache keys are keyed HMACs, so plaintext passwords are never held in memory.
+        self._cache_secret = os.urandom(32)
+        # Unknown users are checked against a throwaway hash so both paths cost the same.
+        self._dummy_hash = hash_password(os.urandom(16).hex(), iterations)
+
+    def _cache_key(self, username: str, password: str) -> bytes:
+        message = _encode(username) + b"\0" + _encode(password)
+        return hmac.new(self._cache_secret, message, hashlib.sha256).digest()
+
+    def set_password(self, username: str, password: str) -> None:
+        with self._hash_slots:
+            password_hash = hash_password(password, self.iterations)
+        self.store.set_password_hash(username, password_hash)
+        self.cache.clear()
+
+    def authenticate(self, username: str, password: str) -> bool:
+        key = self._cache_key(username, password)
+        if self.cache.get(key):
+            return True
+
+        encoded = self.store.get_password_hash(username)
+        with self._hash_slots:
+            ok = verify_password(password, encoded or self._dummy_hash)
+        ok = ok and encoded is not None
+        if ok:
+            self.cache.set(key, True)
+        return ok